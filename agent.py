@@ -1,14 +1,502 @@
 """Recruitment Assistant Agent using Agno framework"""
+import asyncio
+import json
+import logging
 import os
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
-from agno.agent import Agent
-# from agno.models.openai import OpenAIChat
-from agno.models.google import Gemini
-from agno.db.sqlite import SqliteDb
-from tools import CollectUserInfoTool, GetCurrentJobsTool, RecruitmentSearchTool
-from knowledge_base import setup_knowledge_base
-from agno.db.base import  SessionType
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+from agno.db.base import SessionType
+
+# SQLAlchemy/SqliteDb are imported in get_sqlite_db, and Agent, model, tools
+# and knowledge base imports live in _build_agent/_create_agent, so importing
+# this module stays cheap: the HR dashboard (get_session_index,
+# fetch_messages_bulk) only pays for raw sqlite3 queries
+if TYPE_CHECKING:
+    from agno.db.sqlite import SqliteDb
+
+logger = logging.getLogger(__name__)
+
+# Session table used by SqliteDb (agno's default name, pinned so raw queries match)
+SESSION_TABLE = "agno_sessions"
+
+# SQLite tuning applied to every new connection: WAL lets the HR dashboard read
+# while the agent writes, and NORMAL sync is safe under WAL.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record=None):
+    """Apply SQLITE_PRAGMAS to a raw sqlite3 connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+@lru_cache(maxsize=8)
+def get_sqlite_db(db_file: str) -> "SqliteDb":
+    """
+    Get the shared SqliteDb for db_file (created once per process).
+    
+    The engine applies SQLITE_PRAGMAS on connect.
+    
+    Args:
+        db_file: Path to SQLite database file
+    
+    Returns:
+        SqliteDb instance
+    """
+    from sqlalchemy import create_engine, event
+    from agno.db.sqlite import SqliteDb
+    
+    db_path = Path(db_file).resolve()
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    engine = create_engine(f"sqlite:///{db_path}")
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
+    return SqliteDb(db_file=db_file, db_engine=engine, session_table=SESSION_TABLE)
+
+
+@lru_cache(maxsize=None)
+def _session_lister_name(db_type: type) -> Optional[str]:
+    """Name of the session listing method a database class provides, if any"""
+    for name in ('list_sessions', 'get_sessions'):
+        if callable(getattr(db_type, name, None)):
+            return name
+    return None
+
+
+def _get_session_lister(db):
+    """
+    Resolve the database's session listing method.
+    
+    Args:
+        db: Session database (e.g. SqliteDb)
+    
+    Returns:
+        Bound list_sessions/get_sessions method, or None if the database has neither
+    """
+    name = _session_lister_name(type(db))
+    return getattr(db, name) if name else None
+
+
+# Composite index for the HR session list (filter by type, order by creation);
+# created once the session table exists, since agno creates it on first write
+SESSION_INDEX_NAME = f"idx_{SESSION_TABLE}_type_created"
+SESSION_INDEX = (
+    f"CREATE INDEX IF NOT EXISTS {SESSION_INDEX_NAME} ON {SESSION_TABLE}(session_type, created_at DESC)"
+)
+
+
+def _ensure_session_indexes(conn: sqlite3.Connection) -> None:
+    """Create SESSION_INDEX if missing and refresh planner statistics (session table must exist)"""
+    if conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (SESSION_INDEX_NAME,)
+    ).fetchone():
+        return
+    conn.execute(SESSION_INDEX)
+    conn.execute("ANALYZE")
+    conn.commit()
+
+
+@dataclass(slots=True)
+class SessionRow:
+    """Minimal session record returned by the raw-SQL fallback"""
+    session_id: str
+    user_id: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    runs: list = field(default_factory=list)
+    preview: str = ""
+    msg_count: int = 0
+
+
+@dataclass(slots=True)
+class SessionMessage:
+    """User/assistant message normalized once when a conversation is loaded"""
+    role: str
+    content: str
+
+
+# Session listing for the raw-SQL fallback; run counts come from the runs JSON
+SESSION_LIST_QUERY = f"""
+    SELECT session_id, user_id, created_at, updated_at, COALESCE(json_array_length(runs), 0)
+    FROM {SESSION_TABLE}
+    WHERE session_type = ?
+    ORDER BY created_at DESC
+"""
+
+
+# List-view columns added to the session table: the first user message
+# (truncated) and the non-system message count. A row is re-summarized when its
+# updated_at moves past summary_updated_at, so the HR list never reads runs.
+SESSION_SUMMARY_COLUMNS = (
+    ("preview", "TEXT"),
+    ("msg_count", "INTEGER"),
+    ("summary_updated_at", "INTEGER"),
+)
+PREVIEW_CHARS = 200
+
+# First user message and non-system message count of a runs JSON value
+_PREVIEW_SQL = f"""COALESCE((
+            SELECT substr(json_extract(m.value, '$.content'), 1, {PREVIEW_CHARS})
+            FROM json_each({{runs}}) AS r, json_each(r.value, '$.messages') AS m
+            WHERE json_extract(m.value, '$.role') = 'user'
+              AND COALESCE(json_extract(m.value, '$.content'), '') != ''
+            ORDER BY r.key, m.key
+            LIMIT 1
+        ), '')"""
+_MSG_COUNT_SQL = """(
+            SELECT COUNT(*)
+            FROM json_each({runs}) AS r, json_each(r.value, '$.messages') AS m
+            WHERE COALESCE(json_extract(m.value, '$.role'), '') != 'system'
+        )"""
+
+
+def _session_summary_update(row: str) -> str:
+    """UPDATE setting the summary columns from the runs of the given row reference"""
+    runs = f"{row}.runs"
+    return f"""
+    UPDATE {SESSION_TABLE} SET
+        preview = {_PREVIEW_SQL.format(runs=runs)},
+        msg_count = {_MSG_COUNT_SQL.format(runs=runs)},
+        summary_updated_at = COALESCE({row}.updated_at, {row}.created_at)
+    """
+
+
+# Backfill for rows written before the triggers below existed (run when they are installed)
+SESSION_SUMMARY_REFRESH = (
+    _session_summary_update(SESSION_TABLE)
+    + "WHERE summary_updated_at IS NOT COALESCE(updated_at, created_at)"
+)
+
+# Keep the summary columns current at write time, whichever code path saves
+# the session (agent runs, cached answers)
+SESSION_SUMMARY_TRIGGERS = tuple(
+    f"""CREATE TRIGGER IF NOT EXISTS {SESSION_TABLE}_summary_{suffix} {event} ON {SESSION_TABLE} BEGIN
+        {_session_summary_update("new")} WHERE rowid = new.rowid;
+    END"""
+    for suffix, event in (("ai", "AFTER INSERT"), ("au", "AFTER UPDATE OF runs"))
+)
+
+
+# Serializes writes (index creation) made through raw sqlite3 connections.
+# Reads need no lock: WAL lets readers run alongside the writer, and each
+# thread has its own connection.
+_sqlite_write_lock = threading.Lock()
+_sqlite_local = threading.local()
+
+
+@lru_cache(maxsize=8)
+def _prepare_sqlite_file(db_file: str) -> None:
+    """Apply persistent pragmas once per database file"""
+    with _sqlite_write_lock:
+        conn = sqlite3.connect(db_file)
+        try:
+            _apply_sqlite_pragmas(conn)
+        finally:
+            conn.close()
+
+
+def _get_sqlite_connection(db_file: str) -> sqlite3.Connection:
+    """Get this thread's long-lived raw sqlite3 connection for db_file (used by fallback queries)"""
+    connections = getattr(_sqlite_local, 'connections', None)
+    if connections is None:
+        connections = _sqlite_local.connections = {}
+    conn = connections.get(db_file)
+    if conn is None:
+        _prepare_sqlite_file(db_file)
+        conn = sqlite3.connect(db_file)
+        _apply_sqlite_pragmas(conn)
+        connections[db_file] = conn
+    return conn
+
+
+# Database files whose session table already has SESSION_SUMMARY_COLUMNS and SESSION_INDEX
+_summary_columns_ready: set = set()
+
+
+def _ensure_session_summary_columns(conn: sqlite3.Connection, db_file: str) -> bool:
+    """
+    Add SESSION_SUMMARY_COLUMNS, their triggers and SESSION_INDEX to the session table if missing (caller holds the write lock).
+    
+    Rows written before the triggers existed are backfilled once, when the
+    triggers are installed; afterwards the triggers keep every row current.
+    
+    Returns:
+        False if the session table does not exist yet
+    """
+    if db_file in _summary_columns_ready:
+        return True
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({SESSION_TABLE})")}
+    if not existing:
+        return False
+    triggers = {
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ?", (SESSION_TABLE,)
+        )
+    }
+    for name, column_type in SESSION_SUMMARY_COLUMNS:
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {SESSION_TABLE} ADD COLUMN {name} {column_type}")
+    if not {f"{SESSION_TABLE}_summary_ai", f"{SESSION_TABLE}_summary_au"} <= triggers:
+        for statement in SESSION_SUMMARY_TRIGGERS:
+            conn.execute(statement)
+        updated = conn.execute(SESSION_SUMMARY_REFRESH).rowcount
+        logger.info("✅ Installed session summary triggers (%d sessions backfilled)", updated)
+    conn.commit()
+    _ensure_session_indexes(conn)
+    _summary_columns_ready.add(db_file)
+    return True
+
+
+def ensure_session_summaries(db_file: str) -> bool:
+    """
+    Install the session summary columns/triggers once per database file.
+    
+    A no-op once installed, and until the session table exists.
+    
+    Args:
+        db_file: Path to SQLite database for session storage
+    
+    Returns:
+        True if the summary columns are available
+    """
+    if db_file in _summary_columns_ready:
+        return True
+    conn = _get_sqlite_connection(db_file)
+    try:
+        with _sqlite_write_lock:
+            return _ensure_session_summary_columns(conn, db_file)
+    except sqlite3.Error:
+        logger.exception("Error installing session summaries")
+        return False
+
+
+AGENT_DESCRIPTION: str = (
+    "Bạn là trợ lý tuyển dụng thông minh, chuyên nghiệp và thân thiện. "
+    "Nhiệm vụ của bạn là hỗ trợ ứng viên trong quá trình tìm việc và tuyển dụng."
+)
+
+# Built once at import; shared by every RecruitmentAgent
+AGENT_INSTRUCTIONS: tuple[str, ...] = (
+    # Greeting and behavior
+    "Luôn chào hỏi thân thiện khi bắt đầu cuộc trò chuyện.",
+    "Sử dụng ngôn ngữ lịch sự, chuyên nghiệp nhưng gần gũi với ứng viên.",
+    "Gọi ứng viên bằng 'bạn' và tự xưng là 'mình' hoặc 'em'.",
+    # Knowledge base usage and web search strictness - QnA Priority Flow
+    "Đối với câu hỏi dạng QnA (Question and Answer - câu hỏi cần câu trả lời thông tin):",
+    "BƯỚC 1: LUÔN LUÔN retrieve/tra cứu từ knowledge base TRƯỚC TIÊN khi trả lời câu hỏi.",
+    "BƯỚC 2: Nếu knowledge base có thông tin phù hợp 100 (dù chỉ một phần), HÃY trả lời dựa trên thông tin đó Và Kết thúc.  NẾU KHÔNG ĐẠT 100% KHỚP hoặc có bất kỳ nghi ngờ nào về độ liên quan/độ phủ, LUÔN LUÔN sử dụng tool 'recruitment_search_tool' để tra cứu web ở bước BƯỚC 3.",
+    "BƯỚC 3: CHỈ sử dụng tool 'recruitment_search_tool' để tra cứu web  KHI:",
+    "   - Knowledge base KHÔNG có thông tin liên quan, HOẶC",
+    "   - Thông tin từ knowledge base KHÔNG ĐỦ để trả lời đầy đủ câu hỏi.",
+    "TUYỆT ĐỐI không suy đoán hay bịa nội dung khi bằng chứng không rõ ràng. Nếu thiếu thông tin, hãy nói rõ và đề nghị tìm kiếm/cung cấp thêm dữ liệu.",
+    "Mọi câu trả lời dựa trên web search phải kèm TRÍCH DẪN nguồn dạng liên kết (URL) ở cuối câu trả lời, liệt kê 1–3 nguồn chính xác.",
+    "Khi sử dụng kết quả tìm kiếm, hãy tổng hợp ngắn gọn, rõ ràng, có cấu trúc, và nêu nguồn.",
+    # Job search behavior
+    "Khi người dùng hỏi về tìm kiếm công việc hoặc vị trí tuyển dụng, HÃY sử dụng tool 'get_current_jobs' để tìm các vị trí phù hợp.",
+    "Phân tích ý định của người dùng để xác định vị trí (position) và kỹ năng (skills) họ quan tâm.",
+    "Nếu KHÔNG có vị trí nào phù hợp, HÃY trả lời: 'Rất tiếc, hiện tại mình không có vị trí nào phù hợp với yêu cầu của bạn. Bạn có thể để lại thông tin để bộ phận tuyển dụng phản hồi lại nếu có job phù hợp nhé!'",
+    "Sau khi đưa ra danh sách công việc, HÃY hỏi xem người dùng có quan tâm và muốn để lại thông tin không.",
+    # Collecting user information
+    "Khi người dùng muốn ứng tuyển hoặc để lại thông tin, HÃY sử dụng tool 'save_user_info' để lưu thông tin.",
+    "Thông tin BẮT BUỘC: Tên (name) và Email (email).",
+    "Thông tin TÙY CHỌN: Số điện thoại (phone) và Link profile/CV (profile_link).",
+    "Nếu người dùng chưa cung cấp đủ thông tin bắt buộc, HÃY hỏi lại một cách lịch sự.",
+    "Nếu người dùng đề cập đến một vị trí cụ thể, HÃY lấy 'job_id' tương ứng từ danh sách job (qua tool 'get_current_jobs' hoặc dữ liệu đã tải) và truyền 'job_id' khi gọi 'save_user_info'.",
+    "Nếu người dùng nhắc nhiều vị trí hoặc chưa rõ, HÃY hỏi lại để xác nhận vị trí trước khi lưu và chỉ truyền 'job_id' khi đã rõ ràng.",
+    "Sau khi lưu thông tin thành công, HÃY cảm ơn và thông báo bộ phận tuyển dụng sẽ liên hệ sớm.",
+    # General behavior
+    "Nếu câu hỏi KHÔNG liên quan đến tuyển dụng, hãy lịch sự từ chối và hướng dẫn người dùng quay lại chủ đề tuyển dụng.",
+    "Luôn kết thúc câu trả lời bằng một câu hỏi mở để tiếp tục cuộc trò chuyện.",
+    "Sử dụng emoji một cách phù hợp để tạo sự thân thiện (nhưng không lạm dụng).",
+    # Context and memory
+    "Ghi nhớ thông tin người dùng đã chia sẻ trong cuộc trò chuyện để tạo trải nghiệm cá nhân hóa.",
+    "Tham khảo lịch sử trò chuyện để hiểu ngữ cảnh và tránh hỏi lại thông tin đã có.",
+)
+
+
+# Conversation history sent to the model on each turn
+NUM_HISTORY_RUNS = 5
+MAX_TOOL_CALLS_FROM_HISTORY = 2
+
+
+def _create_model(provider: str, model_id: str):
+    """
+    Create the chat model for the given provider.
+    
+    Args:
+        provider: "gemini" or "openai"
+        model_id: Model ID for that provider
+    
+    Returns:
+        Agno model instance
+    """
+    if provider == "gemini":
+        from agno.models.google import Gemini
+        return Gemini(id=model_id)
+    if provider == "openai":
+        from agno.models.openai import OpenAIChat
+        return OpenAIChat(id=model_id)
+    raise ValueError(f"Unsupported model provider: {provider}")
+
+
+@lru_cache(maxsize=4)
+def _build_agent(
+    provider: str,
+    model_id: str,
+    db_file: str,
+    lancedb_path: str,
+    jobs_file: str,
+    knowledge_csv: str,
+    use_google_sheets: bool,
+    enable_media_storage: bool = False,
+):
+    """
+    Build the Agno Agent with its database, knowledge base and tools.
+    
+    Cached per configuration so that further RecruitmentAgent instances reuse
+    the same Agent instead of reconnecting to Gemini and LanceDB.
+    
+    Returns:
+        Agent instance
+    """
+    from tools import CollectUserInfoTool, GetCurrentJobsTool, RecruitmentSearchTool
+    from knowledge_base import setup_knowledge_base
+    
+    # Initialize database for session management
+    db = get_sqlite_db(db_file)
+    
+    get_jobs_tool = GetCurrentJobsTool(
+        jobs_file=jobs_file,
+        use_google_sheets=use_google_sheets
+    )
+    
+    # Setup knowledge base (will load from Google Sheets if configured) while
+    # the jobs list is loaded in parallel, so startup waits for the slower of
+    # the two Sheets fetches instead of both and the first job query is warm
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        knowledge_future = executor.submit(
+            setup_knowledge_base,
+            lancedb_path=lancedb_path,
+            csv_file=knowledge_csv,
+            use_google_sheets=use_google_sheets,
+        )
+        jobs_future = executor.submit(get_jobs_tool._load_jobs)
+        knowledge = knowledge_future.result()
+        try:
+            jobs_future.result()
+        except Exception:
+            logger.warning("⚠️ Could not preload jobs, they will be loaded on first use", exc_info=True)
+    
+    # Create the agent
+    return _create_agent(
+        model=_create_model(provider, model_id),
+        db=db,
+        knowledge=knowledge,
+        tools=[
+            CollectUserInfoTool(),
+            get_jobs_tool,
+            RecruitmentSearchTool(),
+        ],
+        enable_media_storage=enable_media_storage,
+    )
+
+
+def _create_agent(model, db, knowledge, tools: list, enable_media_storage: bool = False):
+    """
+    Create an Agno Agent with the recruitment instructions and settings.
+    
+    Args:
+        model: Chat model (see _create_model)
+        db: Session database, or None to keep no session history
+        knowledge: Knowledge base
+        tools: Toolkits the agent can call
+        enable_media_storage: Persist images/audio/files exchanged in runs
+    
+    Returns:
+        Agent instance
+    """
+    from agno.agent import Agent
+    
+    return Agent(
+        name="Recruitment Assistant",
+        model=model,
+        db=db,
+        knowledge=knowledge,
+        telemetry=False,
+        tools=tools,
+        description=AGENT_DESCRIPTION,
+        instructions=list(AGENT_INSTRUCTIONS),
+        # Session management
+        add_history_to_context=True,
+        num_history_runs=NUM_HISTORY_RUNS,
+        # Old tool outputs (job lists, web search results) dominate history
+        # tokens; only the most recent ones are replayed to the model
+        max_tool_calls_from_history=MAX_TOOL_CALLS_FROM_HISTORY,
+        # Response settings
+        markdown=True,
+        # Enable search across sessions if needed
+        search_session_history=False,  # Can enable if needed
+        # Storage settings
+        store_media=enable_media_storage,  # Text-only chat; no media to persist by default
+        store_tool_messages=True,
+        store_history_messages=True,
+    )
+
+
+# Answers from runs that called these tools are not cached: they changed state
+# (save_user_info) or depend on data that changes under the cache (the jobs list)
+UNCACHEABLE_TOOLS = frozenset({"save_user_info", "get_current_jobs"})
+
+# Semantic cache scope for first messages of a session, shared by all users
+SHARED_CACHE_SCOPE = "*"
+
+# Prerendered answers to the suggested questions, kept across restarts until the
+# model or the knowledge CSV changes
+PRERENDER_FILE = "tmp/prerendered_answers.json"
+
+
+def _cacheable_content(run_output) -> Optional[str]:
+    """Answer text of a finished run, or None if it is empty or called an UNCACHEABLE_TOOLS tool"""
+    content = getattr(run_output, 'content', None)
+    if not isinstance(content, str) or not content:
+        return None
+    if any(tool.tool_name in UNCACHEABLE_TOOLS for tool in (run_output.tools or [])):
+        return None
+    return content
+
+
+def _cached_response(content: str, stream: bool, session_id: Optional[str], user_id: Optional[str]):
+    """
+    Wrap a cached answer like an agent response.
+    
+    Returns:
+        Iterator with one RunContentEvent when streaming, otherwise a RunOutput
+    """
+    from agno.run.agent import RunContentEvent, RunOutput
+    
+    if stream:
+        return iter((RunContentEvent(content=content, session_id=session_id),))
+    return RunOutput(content=content, session_id=session_id, user_id=user_id)
+
 
 class RecruitmentAgent:
     """Recruitment Assistant Chatbot Agent"""
@@ -16,22 +504,32 @@ class RecruitmentAgent:
     def __init__(
         self,
         model_id: str = "gemini-2.5-flash", # gpt-5
+        provider: str = "gemini",
         db_file: str = "tmp/recruitment_db.db",
         lancedb_path: str = "tmp/lancedb",
         jobs_file: str = "data/jobs.json",
         knowledge_csv: str = "data/recruitment_knowledge.csv",
         use_google_sheets: bool = True,
+        max_concurrent_chats: int = 4,
+        use_semantic_cache: bool = True,
+        suggested_questions: tuple = (),
+        enable_media_storage: bool = False,
     ):
         """
         Initialize Recruitment Agent.
         
         Args:
-            model_id: OpenAI model ID to use
+            model_id: Model ID to use
+            provider: Model provider, "gemini" or "openai" (default: "gemini")
             db_file: Path to SQLite database for session storage
             lancedb_path: Path to LanceDB for knowledge base
             jobs_file: Path to jobs JSON file (fallback)
             knowledge_csv: Path to recruitment knowledge CSV (fallback)
             use_google_sheets: Whether to load data from Google Sheets (default: True)
+            max_concurrent_chats: Max chat()/achat() calls answered at once, across threads (default: 4)
+            use_semantic_cache: Answer repeated/near-duplicate questions from cache (default: True)
+            suggested_questions: Canned questions whose answers are prerendered into the cache
+            enable_media_storage: Persist images/audio/files exchanged in runs (default: False)
         """
         # Create tmp directory if it doesn't exist
         os.makedirs("tmp", exist_ok=True)
@@ -44,99 +542,364 @@ class RecruitmentAgent:
         self.knowledge_csv = knowledge_csv
         self.use_google_sheets = use_google_sheets
         
-        # Initialize database for session management
-        self.db = SqliteDb(db_file=db_file)
+        # Bound for concurrent chats. A thread semaphore, not an asyncio one:
+        # Streamlit serves each session from its own thread (and event loop)
+        self.max_concurrent_chats = max_concurrent_chats
+        self._chat_slots = threading.BoundedSemaphore(max_concurrent_chats)
         
-        # Setup knowledge base (will load from Google Sheets if configured)
-        self.knowledge = setup_knowledge_base(
+        # Agent, knowledge base and tools are built once per configuration
+        self.agent = _build_agent(
+            provider=provider,
+            model_id=model_id,
+            db_file=db_file,
             lancedb_path=lancedb_path,
-            csv_file=knowledge_csv,
+            jobs_file=jobs_file,
+            knowledge_csv=knowledge_csv,
             use_google_sheets=use_google_sheets,
+            enable_media_storage=enable_media_storage,
         )
+        self.db = self.agent.db
+        self._list_sessions = _get_session_lister(self.db)
+        # Install the session summary columns/triggers so previews are written
+        # with each run (no-op until the session table exists)
+        ensure_session_summaries(db_file)
+        self.knowledge = self.agent.knowledge
+        self.collect_info_tool, self.get_jobs_tool, self.search_tool = self.agent.tools
         
-        # Initialize tools
-        self.collect_info_tool = CollectUserInfoTool()
-        self.get_jobs_tool = GetCurrentJobsTool(
-            jobs_file=jobs_file,
-            use_google_sheets=use_google_sheets
-        )
-        self.search_tool = RecruitmentSearchTool()
-        
-        # Create the agent
-        self.agent = Agent(
-            name="Recruitment Assistant",
-            model=Gemini(id=model_id),
-            db=self.db,
-            knowledge=self.knowledge,
-            telemetry=False,
-            tools=[
-                self.collect_info_tool,
-                self.get_jobs_tool,
-                self.search_tool,
-            ],
-            description=(
-                "Bạn là trợ lý tuyển dụng thông minh, chuyên nghiệp và thân thiện. "
-                "Nhiệm vụ của bạn là hỗ trợ ứng viên trong quá trình tìm việc và tuyển dụng."
-            ),
-            instructions=[
-                # Greeting and behavior
-                "Luôn chào hỏi thân thiện khi bắt đầu cuộc trò chuyện.",
-                "Sử dụng ngôn ngữ lịch sự, chuyên nghiệp nhưng gần gũi với ứng viên.",
-                "Gọi ứng viên bằng 'bạn' và tự xưng là 'mình' hoặc 'em'.",
-                # Knowledge base usage and web search strictness - QnA Priority Flow
-                "Đối với câu hỏi dạng QnA (Question and Answer - câu hỏi cần câu trả lời thông tin):",
-                "BƯỚC 1: LUÔN LUÔN retrieve/tra cứu từ knowledge base TRƯỚC TIÊN khi trả lời câu hỏi.",
-                "BƯỚC 2: Nếu knowledge base có thông tin phù hợp 100 (dù chỉ một phần), HÃY trả lời dựa trên thông tin đó Và Kết thúc.  NẾU KHÔNG ĐẠT 100% KHỚP hoặc có bất kỳ nghi ngờ nào về độ liên quan/độ phủ, LUÔN LUÔN sử dụng tool 'recruitment_search_tool' để tra cứu web ở bước BƯỚC 3.",
-                "BƯỚC 3: CHỈ sử dụng tool 'recruitment_search_tool' để tra cứu web  KHI:",
-                "   - Knowledge base KHÔNG có thông tin liên quan, HOẶC",
-                "   - Thông tin từ knowledge base KHÔNG ĐỦ để trả lời đầy đủ câu hỏi.",
-                "TUYỆT ĐỐI không suy đoán hay bịa nội dung khi bằng chứng không rõ ràng. Nếu thiếu thông tin, hãy nói rõ và đề nghị tìm kiếm/cung cấp thêm dữ liệu.",
-                "Mọi câu trả lời dựa trên web search phải kèm TRÍCH DẪN nguồn dạng liên kết (URL) ở cuối câu trả lời, liệt kê 1–3 nguồn chính xác.",
-                "Khi sử dụng kết quả tìm kiếm, hãy tổng hợp ngắn gọn, rõ ràng, có cấu trúc, và nêu nguồn.",
-                # Job search behavior
-                "Khi người dùng hỏi về tìm kiếm công việc hoặc vị trí tuyển dụng, HÃY sử dụng tool 'get_current_jobs' để tìm các vị trí phù hợp.",
-                "Phân tích ý định của người dùng để xác định vị trí (position) và kỹ năng (skills) họ quan tâm.",
-                "Nếu KHÔNG có vị trí nào phù hợp, HÃY trả lời: 'Rất tiếc, hiện tại mình không có vị trí nào phù hợp với yêu cầu của bạn. Bạn có thể để lại thông tin để bộ phận tuyển dụng phản hồi lại nếu có job phù hợp nhé!'",
-                "Sau khi đưa ra danh sách công việc, HÃY hỏi xem người dùng có quan tâm và muốn để lại thông tin không.",
-                # Collecting user information
-                "Khi người dùng muốn ứng tuyển hoặc để lại thông tin, HÃY sử dụng tool 'save_user_info' để lưu thông tin.",
-                "Thông tin BẮT BUỘC: Tên (name) và Email (email).",
-                "Thông tin TÙY CHỌN: Số điện thoại (phone) và Link profile/CV (profile_link).",
-                "Nếu người dùng chưa cung cấp đủ thông tin bắt buộc, HÃY hỏi lại một cách lịch sự.",
-                "Nếu người dùng đề cập đến một vị trí cụ thể, HÃY lấy 'job_id' tương ứng từ danh sách job (qua tool 'get_current_jobs' hoặc dữ liệu đã tải) và truyền 'job_id' khi gọi 'save_user_info'.",
-                "Nếu người dùng nhắc nhiều vị trí hoặc chưa rõ, HÃY hỏi lại để xác nhận vị trí trước khi lưu và chỉ truyền 'job_id' khi đã rõ ràng.",
-                "Sau khi lưu thông tin thành công, HÃY cảm ơn và thông báo bộ phận tuyển dụng sẽ liên hệ sớm.",
-                # General behavior
-                "Nếu câu hỏi KHÔNG liên quan đến tuyển dụng, hãy lịch sự từ chối và hướng dẫn người dùng quay lại chủ đề tuyển dụng.",
-                "Luôn kết thúc câu trả lời bằng một câu hỏi mở để tiếp tục cuộc trò chuyện.",
-                "Sử dụng emoji một cách phù hợp để tạo sự thân thiện (nhưng không lạm dụng).",
-                # Context and memory
-                "Ghi nhớ thông tin người dùng đã chia sẻ trong cuộc trò chuyện để tạo trải nghiệm cá nhân hóa.",
-                "Tham khảo lịch sử trò chuyện để hiểu ngữ cảnh và tránh hỏi lại thông tin đã có.",
-            ],
-            # Session management
-            add_history_to_context=True,
-            num_history_runs=5,
-            # Response settings
-            markdown=True,
-            # Enable search across sessions if needed
-            search_session_history=False,  # Can enable if needed
-            # Storage settings
-            store_media=True,
-            store_tool_messages=True,
-            store_history_messages=True,
-        )
+        # Semantic response cache in front of chat(), embedding prompts with
+        # the knowledge base's embedder
+        self.model_id = model_id
+        self.provider = provider
+        self.enable_media_storage = enable_media_storage
+        self.response_cache = None
+        # Separate Agent (own model client, no session storage) for prerendering
+        self._prerender_agent = None
+        self.suggested_questions = tuple(suggested_questions)
+        if use_semantic_cache:
+            from semantic_cache import create_semantic_cache
+            embedder = self.knowledge.vector_db.embedder
+            self.response_cache = create_semantic_cache(
+                embed=embedder.get_embedding,
+                embed_many=lambda texts: asyncio.run(embedder.async_get_embeddings_batch_and_usage(texts))[0],
+            )
+            # Warm the cache from past sessions and prerender the suggested
+            # questions without blocking startup
+            threading.Thread(
+                target=self._warm_and_prerender, args=(self.suggested_questions,), daemon=True
+            ).start()
     
     def chat(
         self,
         message: str,
         user_id: Optional[str] = None,
         session_id: Optional[str] = None,
-        stream: bool = False,
+        stream: bool = True,
     ):
         """
         Send a message to the agent and get response.
         
+        Streams by default so the first tokens reach the UI while the rest of
+        the answer is still being generated.
+        
+        Args:
+            message: User message
+            user_id: User ID for session management
+            session_id: Session ID for conversation continuity
+            stream: Whether to stream the response (default: True)
+        
+        Returns:
+            Iterator of response chunks when streaming, otherwise the agent response
+        """
+        scope = None
+        if self.response_cache is not None:
+            scope = self._cache_scope(user_id, session_id)
+            cached = self.response_cache.lookup(message, scope=scope)
+            if cached is not None:
+                logger.info("⚡ Semantic cache hit for session %s", session_id)
+                self._record_cached_run(message, cached, user_id, session_id)
+                return _cached_response(cached, stream=stream, session_id=session_id, user_id=user_id)
+        
+        if stream:
+            # The run starts when the stream is first read, so the slot is taken there
+            response = self.agent.run(
+                input=message,
+                user_id=user_id,
+                session_id=session_id,
+                stream=True,
+                yield_run_response=scope is not None,
+            )
+            return self._stream_and_cache(response, message, scope)
+        with self._chat_slots:
+            response = self.agent.run(
+                input=message,
+                user_id=user_id,
+                session_id=session_id,
+                stream=False,
+            )
+        if scope is not None:
+            self._cache_response(message, scope, response)
+        return response
+    
+    def _cache_scope(self, user_id: Optional[str], session_id: Optional[str]) -> str:
+        """
+        Semantic cache partition for a message.
+        
+        The first message of a session has no history, so its answer is shared
+        by all users of the model; later messages depend on the conversation
+        and are only cached for the same user. "First" is read from the stored
+        session so it survives restarts.
+        """
+        if session_id is None or not self._has_stored_runs(session_id):
+            return f"{SHARED_CACHE_SCOPE}:{self.model_id}"
+        return f"{user_id or 'anon'}:{self.model_id}"
+    
+    def _has_stored_runs(self, session_id: str) -> bool:
+        """Whether the session already has runs in the database (counted in SQL, nothing deserialized)"""
+        try:
+            if not ensure_session_summaries(self.db_file):
+                return False  # No session table yet, so no runs
+            row = _get_sqlite_connection(self.db_file).execute(
+                f"SELECT json_array_length(runs) FROM {SESSION_TABLE} WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        except sqlite3.Error:
+            logger.exception("Error reading session %s", session_id)
+            # Unknown history: never share the answer across users
+            return True
+        return bool(row and row[0])
+    
+    def _record_cached_run(
+        self,
+        message: str,
+        content: str,
+        user_id: Optional[str],
+        session_id: Optional[str],
+    ) -> None:
+        """Append a cache-served answer to the session so later turns see it in history"""
+        if session_id is None:
+            return
+        from agno.models.message import Message
+        from agno.run.agent import RunInput, RunOutput
+        from agno.run.base import RunStatus
+        from agno.session import AgentSession
+        
+        try:
+            self.agent.set_id()
+            session = self.db.get_session(session_id=session_id, session_type=SessionType.AGENT)
+            if session is None:
+                session = AgentSession(
+                    session_id=session_id,
+                    agent_id=self.agent.id,
+                    user_id=user_id,
+                    created_at=int(datetime.now().timestamp()),
+                )
+            session.upsert_run(RunOutput(
+                run_id=str(uuid.uuid4()),
+                agent_id=self.agent.id,
+                session_id=session_id,
+                user_id=user_id,
+                input=RunInput(input_content=message),
+                content=content,
+                messages=[
+                    Message(role="user", content=message),
+                    Message(role="assistant", content=content),
+                ],
+                status=RunStatus.completed,
+            ))
+            self.db.upsert_session(session)
+        except Exception:
+            logger.exception("Error recording cached answer in session %s", session_id)
+    
+    def _prerender_version(self) -> str:
+        """Version of the prerendered answers: model plus knowledge CSV modification time"""
+        try:
+            knowledge_mtime = os.path.getmtime(self.knowledge_csv)
+        except OSError:
+            knowledge_mtime = 0
+        return f"{self.model_id}:{knowledge_mtime}"
+    
+    def _load_prerendered(self) -> dict:
+        """Persisted question -> answer pairs, empty if missing or outdated"""
+        try:
+            with open(PRERENDER_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != self._prerender_version():
+            return {}
+        return data.get("answers") or {}
+    
+    def _save_prerendered(self, answers: dict) -> None:
+        """Persist question -> answer pairs for the next start"""
+        try:
+            tmp_path = PRERENDER_FILE + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": self._prerender_version(), "answers": answers}, f, ensure_ascii=False)
+            os.replace(tmp_path, PRERENDER_FILE)
+        except OSError:
+            logger.exception("Error saving prerendered answers")
+    
+    def _get_prerender_agent(self):
+        """
+        Agent used to prerender answers, built on first use.
+        
+        It shares the knowledge base and tools but has its own model client and
+        no database, so prerendering neither competes with users on the chat
+        Agent nor writes throwaway sessions.
+        """
+        if self._prerender_agent is None:
+            self._prerender_agent = _create_agent(
+                model=_create_model(self.provider, self.model_id),
+                db=None,
+                knowledge=self.knowledge,
+                tools=list(self.agent.tools),
+                enable_media_storage=self.enable_media_storage,
+            )
+        return self._prerender_agent
+    
+    def prerender_answers(self, questions) -> int:
+        """
+        Answer canned questions ahead of time so they are served from the cache.
+        
+        Answers persisted in PRERENDER_FILE by an earlier start are loaded
+        instead of regenerated while the model and knowledge CSV are unchanged.
+        Questions already in the shared cache (e.g. warmed from past sessions)
+        are skipped. The rest are answered by a separate prerender Agent.
+        
+        Args:
+            questions: Questions to answer (e.g. the UI's suggested questions)
+        
+        Returns:
+            Number of answers generated
+        """
+        if self.response_cache is None:
+            return 0
+        scope = f"{SHARED_CACHE_SCOPE}:{self.model_id}"
+        persisted = self._load_prerendered()
+        answers = {question: persisted[question] for question in questions if question in persisted}
+        if answers:
+            self.response_cache.store_many(list(answers.items()), scope=scope)
+        
+        rendered = 0
+        for question in questions:
+            if question in answers or self.response_cache.lookup(question, scope=scope) is not None:
+                continue
+            try:
+                response = self._get_prerender_agent().run(input=question, stream=False)
+            except Exception:
+                logger.exception("Error prerendering answer for %r", question)
+                continue
+            content = _cacheable_content(response)
+            if content is not None:
+                self.response_cache.store(question, content, scope=scope)
+                answers[question] = content
+                rendered += 1
+        if rendered:
+            self._save_prerendered(answers)
+        logger.info("✅ Prerendered %d suggested answers (%d loaded from %s)", rendered,
+                    len(answers) - rendered, PRERENDER_FILE)
+        return rendered
+    
+    def _warm_and_prerender(self, questions) -> None:
+        """Background startup work: warm the cache, then fill in canned questions"""
+        self.warm_response_cache()
+        self.prerender_answers(questions)
+    
+    def warm_response_cache(self, days: int = 30, limit: int = 1024) -> int:
+        """
+        Load first-turn question/answer pairs from past sessions into the semantic cache.
+        
+        Questions asked most often are kept first.
+        
+        Args:
+            days: How far back to read sessions
+            limit: Maximum number of pairs to load
+        
+        Returns:
+            Number of pairs loaded
+        """
+        if self.response_cache is None or self._list_sessions is None:
+            return 0
+        try:
+            from semantic_cache import normalize_prompt
+            
+            since = int(datetime.now().timestamp()) - days * 86400
+            result = self._list_sessions(
+                session_type=SessionType.AGENT, start_timestamp=since, deserialize=False
+            )
+            sessions = result[0] if isinstance(result, tuple) else result
+            
+            # Count each normalized first question; keep the latest answer for it
+            hit_counts = Counter()
+            answers = {}
+            for session in sessions or []:
+                runs = session.get('runs') if isinstance(session, dict) else None
+                if not runs:
+                    continue
+                run = runs[0]
+                prompt = (run.get('input') or {}).get('input_content')
+                content = run.get('content')
+                if not isinstance(prompt, str) or not isinstance(content, str) or not content:
+                    continue
+                if any((tool or {}).get('tool_name') in UNCACHEABLE_TOOLS for tool in run.get('tools') or []):
+                    continue
+                key = normalize_prompt(prompt)
+                hit_counts[key] += 1
+                answers[key] = (prompt, content)
+            
+            items = [answers[key] for key, _ in hit_counts.most_common(limit)]
+            stored = self.response_cache.store_many(items, scope=f"{SHARED_CACHE_SCOPE}:{self.model_id}")
+            logger.info("✅ Warmed semantic cache with %d answers from past sessions", stored)
+            return stored
+        except Exception:
+            logger.exception("Error warming semantic cache")
+            return 0
+    
+    def _cache_response(self, message: str, scope: str, run_output) -> None:
+        """Store a finished run's answer unless it called an UNCACHEABLE_TOOLS tool"""
+        content = _cacheable_content(run_output)
+        if content is not None:
+            self.response_cache.store(message, content, scope=scope)
+    
+    def _stream_and_cache(self, chunks, message: str, scope: Optional[str]):
+        """Forward streamed chunks, holding a chat slot, and cache the final run output (unless scope is None)"""
+        from agno.run.agent import RunOutput
+        
+        with self._chat_slots:
+            for chunk in chunks:
+                # The final RunOutput repeats the whole answer; keep it for caching only
+                if isinstance(chunk, RunOutput):
+                    if scope is not None:
+                        self._cache_response(message, scope, chunk)
+                    continue
+                yield chunk
+    
+    @asynccontextmanager
+    async def _chat_slot(self):
+        """Hold one of the max_concurrent_chats slots, waiting for it in a worker thread"""
+        acquire = asyncio.ensure_future(asyncio.to_thread(self._chat_slots.acquire))
+        try:
+            await asyncio.shield(acquire)
+        except asyncio.CancelledError:
+            # The thread still takes the slot; hand it back once it does
+            acquire.add_done_callback(lambda future: future.cancelled() or self._chat_slots.release())
+            raise
+        try:
+            yield
+        finally:
+            self._chat_slots.release()
+    
+    async def achat(
+        self,
+        message: str,
+        user_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        stream: bool = False,
+    ):
+        """
+        Async version of chat() so concurrent users overlap their LLM round-trips.
+        
+        At most max_concurrent_chats calls (sync or async) run at once.
+        
         Args:
             message: User message
             user_id: User ID for session management
@@ -144,33 +907,85 @@ class RecruitmentAgent:
             stream: Whether to stream the response
         
         Returns:
-            Agent response
+            Async iterator of response chunks when streaming, otherwise the agent response
         """
-        return self.agent.run(
-            input=message,
-            user_id=user_id,
-            session_id=session_id,
-            stream=stream,
-        )
+        if stream:
+            return self._astream(message, user_id, session_id)
+        
+        scope = None
+        if self.response_cache is not None:
+            # Session and embedding lookups are blocking, keep them off the event loop
+            scope = await asyncio.to_thread(self._cache_scope, user_id, session_id)
+            cached = await asyncio.to_thread(self.response_cache.lookup, message, scope)
+            if cached is not None:
+                await asyncio.to_thread(self._record_cached_run, message, cached, user_id, session_id)
+                return _cached_response(cached, stream=False, session_id=session_id, user_id=user_id)
+        
+        async with self._chat_slot():
+            response = await self.agent.arun(
+                input=message,
+                user_id=user_id,
+                session_id=session_id,
+                stream=False,
+            )
+        if self.response_cache is not None:
+            await asyncio.to_thread(self._cache_response, message, scope, response)
+        return response
     
-    def get_session_history(self, session_id: str, user_id: Optional[str] = None):
+    async def _astream(self, message: str, user_id: Optional[str], session_id: Optional[str]):
+        """Stream response chunks from agent.arun, serving and filling the semantic cache"""
+        from agno.run.agent import RunOutput
+        
+        scope = None
+        if self.response_cache is not None:
+            # Session and embedding lookups are blocking, keep them off the event loop
+            scope = await asyncio.to_thread(self._cache_scope, user_id, session_id)
+            cached = await asyncio.to_thread(self.response_cache.lookup, message, scope)
+            if cached is not None:
+                await asyncio.to_thread(self._record_cached_run, message, cached, user_id, session_id)
+                for chunk in _cached_response(cached, stream=True, session_id=session_id, user_id=user_id):
+                    yield chunk
+                return
+        
+        async with self._chat_slot():
+            async for chunk in self.agent.arun(
+                input=message,
+                user_id=user_id,
+                session_id=session_id,
+                stream=True,
+                yield_run_response=self.response_cache is not None,
+            ):
+                # The final RunOutput repeats the whole answer; keep it for caching only
+                if isinstance(chunk, RunOutput):
+                    await asyncio.to_thread(self._cache_response, message, scope, chunk)
+                    continue
+                yield chunk
+    
+    def get_session_history(self, session_id: str, user_id: Optional[str] = None, deserialize: bool = True):
         """
         Get session history.
         
         Args:
             session_id: Session ID
             user_id: User ID (optional)
+            deserialize: Build RunOutput objects; with False the run dicts are
+                returned as decoded from the session's runs column in one pass,
+                which is much cheaper for long sessions that are only displayed
         
         Returns:
             Session history
         """
         try:
-            session = self.db.get_session(session_id=session_id, user_id=user_id, session_type=SessionType.AGENT)
-            if session:
-                return session.runs
-            return []
-        except Exception as e:
-            print(f"Error getting session history: {e}")
+            session = self.db.get_session(
+                session_id=session_id, user_id=user_id, session_type=SessionType.AGENT, deserialize=deserialize
+            )
+            if not session:
+                return []
+            if not deserialize:
+                return session.get("runs") or []
+            return session.runs or []
+        except Exception:
+            logger.exception("Error getting session history")
             return []
     
     def clear_session(self, session_id: str, user_id: Optional[str] = None):
@@ -182,22 +997,24 @@ class RecruitmentAgent:
             user_id: User ID (optional)
         """
         try:
-            # Get session and delete all runs
-            session = self.db.get_session(session_id=session_id, user_id=user_id, session_type=SessionType.AGENT)
-            if session:
-                # Delete the session (this will cascade delete runs)
-                self.db.delete_session(session_id=session_id)
-                print(f"✅ Cleared session {session_id}")
-        except Exception as e:
-            print(f"Error clearing session: {e}")
+            # Only look the session up first when it must belong to user_id;
+            # otherwise a single DELETE (one transaction) is enough
+            if user_id is not None and not self.db.get_session(
+                session_id=session_id, user_id=user_id, session_type=SessionType.AGENT, deserialize=False
+            ):
+                return
+            # Runs are stored on the session row, so this removes them too
+            if self.db.delete_session(session_id=session_id):
+                logger.info("✅ Cleared session %s", session_id)
+        except Exception:
+            logger.exception("Error clearing session")
     
     def reload_knowledge(self):
         """
         Reload knowledge base from Google Sheets or CSV.
         This will refresh the retrieval data without recreating the entire agent.
         """
-        import logging
-        logger = logging.getLogger(__name__)
+        from knowledge_base import setup_knowledge_base
         
         try:
             logger.info("🔄 Đang tải lại dữ liệu retrieval...")
@@ -207,9 +1024,19 @@ class RecruitmentAgent:
                 csv_file=self.knowledge_csv,
                 use_google_sheets=self.use_google_sheets,
                 force_reload=True,  # Force reload from Google Sheets
+                vector_db=self.knowledge.vector_db,  # Keep LanceDB connection and embedder client
             )
             # Update agent's knowledge
             self.agent.knowledge = self.knowledge
+            if self._prerender_agent is not None:
+                self._prerender_agent.knowledge = self.knowledge
+            # Cached answers may be based on the old data; prerender the
+            # suggested questions again against the new data
+            if self.response_cache is not None:
+                self.response_cache.clear()
+                threading.Thread(
+                    target=self.prerender_answers, args=(self.suggested_questions,), daemon=True
+                ).start()
             logger.info("✅ Đã tải lại dữ liệu retrieval thành công")
         except Exception as e:
             logger.error("❌ Lỗi khi tải lại dữ liệu retrieval: %s", e)
@@ -223,89 +1050,13 @@ class RecruitmentAgent:
             List of session objects
         """
         try:
-            # Try to get all sessions using the database's list method
-            # If list_sessions doesn't exist, we'll query directly
-            if hasattr(self.db, 'list_sessions'):
-                sessions = self.db.list_sessions(session_type=SessionType.AGENT)
-                return sessions
-            elif hasattr(self.db, 'get_sessions'):
-                sessions = self.db.get_sessions(session_type=SessionType.AGENT)
-                return sessions
-            else:
-                # Fallback: query SQLite directly
-                import sqlite3
-                # Use the stored db_file path
-                db_path = self.db_file
-                
-                conn = sqlite3.connect(db_path)
-                cursor = conn.cursor()
-                
-                # Query sessions table - try different possible table/column names
-                try:
-                    cursor.execute("""
-                        SELECT session_id, user_id, created_at, updated_at
-                        FROM sessions
-                        WHERE session_type = ?
-                        ORDER BY created_at DESC
-                    """, ('agent',))
-                except:
-                    # Try without session_type filter
-                    try:
-                        cursor.execute("""
-                            SELECT session_id, user_id, created_at, updated_at
-                            FROM sessions
-                            ORDER BY created_at DESC
-                        """)
-                    except:
-                        conn.close()
-                        return []
-                
-                rows = cursor.fetchall()
-                
-                # Get runs count for each session
-                sessions = []
-                for row in rows:
-                    session_id = row[0]
-                    # Count runs for this session
-                    try:
-                        cursor.execute("""
-                            SELECT COUNT(*) FROM runs WHERE session_id = ?
-                        """, (session_id,))
-                        runs_count = cursor.fetchone()[0]
-                    except:
-                        runs_count = 0
-                    
-                    # Parse datetime strings
-                    created_at = None
-                    updated_at = None
-                    try:
-                        if row[2]:
-                            date_str = str(row[2])
-                            created_at = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    except Exception as e:
-                        pass
-                    try:
-                        if row[3]:
-                            date_str = str(row[3])
-                            updated_at = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    except Exception as e:
-                        pass
-                    
-                    session_obj = type('Session', (), {
-                        'session_id': session_id,
-                        'user_id': row[1],
-                        'created_at': created_at,
-                        'updated_at': updated_at,
-                        'runs': [None] * runs_count  # Placeholder for runs count
-                    })()
-                    sessions.append(session_obj)
-                
-                conn.close()
-                return sessions
-        except Exception as e:
-            print(f"Error getting all sessions: {e}")
-            import traceback
-            traceback.print_exc()
+            # Use the database's list method resolved in __init__,
+            # or query SQLite directly if it has none
+            if self._list_sessions is not None:
+                return self._list_sessions(session_type=SessionType.AGENT)
+            return _query_sessions_fallback(self.db_file)
+        except Exception:
+            logger.exception("Error getting all sessions")
             return []
     
     def get_messages_for_session(self, session_id: str):
@@ -321,8 +1072,8 @@ class RecruitmentAgent:
         try:
             messages = self.agent.get_messages_for_session(session_id=session_id)
             return messages
-        except Exception as e:
-            print(f"Error getting messages for session: {e}")
+        except Exception:
+            logger.exception("Error getting messages for session")
             return []
 
 
@@ -352,105 +1103,266 @@ def get_all_sessions_from_db(db_file: str = "tmp/recruitment_db.db"):
     """
     try:
         # Only initialize database, no knowledge base, tools, or model
-        db = SqliteDb(db_file=db_file)
+        db = get_sqlite_db(db_file)
         
         # Try to get all sessions using the database's list method
-        if hasattr(db, 'list_sessions'):
-            sessions = db.list_sessions(session_type=SessionType.AGENT)
-            return sessions
-        elif hasattr(db, 'get_sessions'):
-            sessions = db.get_sessions(session_type=SessionType.AGENT)
-            return sessions
-        else:
-            # Fallback: query SQLite directly
-            import sqlite3
-            
-            conn = sqlite3.connect(db_file)
-            cursor = conn.cursor()
-            
-            # Query sessions table - try different possible table/column names
-            try:
-                cursor.execute("""
-                    SELECT session_id, user_id, created_at, updated_at
-                    FROM sessions
-                    WHERE session_type = ?
-                    ORDER BY created_at DESC
-                """, ('agent',))
-            except:
-                # Try without session_type filter
-                try:
-                    cursor.execute("""
-                        SELECT session_id, user_id, created_at, updated_at
-                        FROM sessions
-                        ORDER BY created_at DESC
-                    """)
-                except:
-                    conn.close()
-                    return []
-            
-            rows = cursor.fetchall()
-            
-            # Get runs for each session
-            sessions = []
-            for row in rows:
-                session_id = row[0]
-                # Get runs for this session
-                try:
-                    cursor.execute("""
-                        SELECT run_id FROM runs WHERE session_id = ?
-                        ORDER BY created_at ASC
-                    """, (session_id,))
-                    run_ids = [r[0] for r in cursor.fetchall()]
-                except:
-                    run_ids = []
-                
-                # Parse datetime strings
-                created_at = None
-                updated_at = None
-                try:
-                    if row[2]:
-                        date_str = str(row[2])
-                        created_at = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                except Exception as e:
-                    pass
-                try:
-                    if row[3]:
-                        date_str = str(row[3])
-                        updated_at = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                except Exception as e:
-                    pass
-                
-                # Get session with runs using database method
-                try:
-                    session = db.get_session(session_id=session_id, session_type=SessionType.AGENT)
-                    if session:
-                        sessions.append(session)
-                    else:
-                        # Fallback: create minimal session object
-                        session_obj = type('Session', (), {
-                            'session_id': session_id,
-                            'user_id': row[1],
-                            'created_at': created_at,
-                            'updated_at': updated_at,
-                            'runs': []
-                        })()
-                        sessions.append(session_obj)
-                except:
-                    # Fallback: create minimal session object
-                    session_obj = type('Session', (), {
-                        'session_id': session_id,
-                        'user_id': row[1],
-                        'created_at': created_at,
-                        'updated_at': updated_at,
-                        'runs': []
-                    })()
-                    sessions.append(session_obj)
-            
-            conn.close()
-            return sessions
-    except Exception as e:
-        print(f"Error getting all sessions: {e}")
-        import traceback
-        traceback.print_exc()
+        list_sessions = _get_session_lister(db)
+        if list_sessions is not None:
+            return list_sessions(session_type=SessionType.AGENT)
+        # Fallback: query SQLite directly
+        return _query_sessions_fallback(db_file)
+    except Exception:
+        logger.exception("Error getting all sessions")
         return []
 
+
+def get_session_from_db(session_id: str, db_file: str = "tmp/recruitment_db.db"):
+    """
+    Load one full session (runs and messages) without initializing the agent.
+    
+    Session lists from the raw-SQL fallback only carry run counts, so the HR
+    dashboard calls this when a conversation is opened.
+    
+    Args:
+        session_id: Session ID
+        db_file: Path to SQLite database for session storage
+    
+    Returns:
+        Session object, or None if not found
+    """
+    try:
+        db = get_sqlite_db(db_file)
+        return db.get_session(session_id=session_id, session_type=SessionType.AGENT)
+    except Exception:
+        logger.exception("Error getting session")
+        return None
+
+
+def _query_sessions_fallback(db_file: str) -> list:
+    """
+    Query sessions with their run counts directly from SQLite.
+    
+    Used when the SqliteDb has no session listing method. Run counts are
+    read from the runs JSON in SQL instead of deserializing each session.
+    
+    Args:
+        db_file: Path to SQLite database for session storage
+    
+    Returns:
+        List of SessionRow (runs holds one placeholder per run)
+    """
+    try:
+        rows = _get_sqlite_connection(db_file).execute(SESSION_LIST_QUERY, ('agent',)).fetchall()
+    except sqlite3.Error:
+        logger.exception("Error listing sessions")
+        return []
+    
+    return [
+        SessionRow(
+            session_id=session_id,
+            user_id=user_id,
+            created_at=datetime.fromtimestamp(created_at) if created_at else None,
+            updated_at=datetime.fromtimestamp(updated_at) if updated_at else None,
+            runs=[None] * runs_count,  # Placeholder for runs count
+        )
+        for session_id, user_id, created_at, updated_at, runs_count in rows
+    ]
+
+
+def _like_pattern(term: str) -> str:
+    """Build a LIKE substring pattern, escaping LIKE wildcards in term"""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+# Trigram full-text index over session_id/user_id for the HR search box, kept
+# in sync with the session table by triggers. Trigrams match substrings of 3+
+# characters; shorter terms fall back to LIKE.
+SESSION_FTS_TABLE = f"{SESSION_TABLE}_fts"
+SESSION_FTS_MIN_TERM = 3
+SESSION_FTS_SETUP = (
+    f"""CREATE VIRTUAL TABLE {SESSION_FTS_TABLE} USING fts5(
+        session_id, user_id, content='{SESSION_TABLE}', content_rowid='rowid', tokenize='trigram'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SESSION_FTS_TABLE}_ai AFTER INSERT ON {SESSION_TABLE} BEGIN
+        INSERT INTO {SESSION_FTS_TABLE}(rowid, session_id, user_id) VALUES (new.rowid, new.session_id, new.user_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SESSION_FTS_TABLE}_ad AFTER DELETE ON {SESSION_TABLE} BEGIN
+        INSERT INTO {SESSION_FTS_TABLE}({SESSION_FTS_TABLE}, rowid, session_id, user_id)
+        VALUES ('delete', old.rowid, old.session_id, old.user_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SESSION_FTS_TABLE}_au AFTER UPDATE OF session_id, user_id ON {SESSION_TABLE} BEGIN
+        INSERT INTO {SESSION_FTS_TABLE}({SESSION_FTS_TABLE}, rowid, session_id, user_id)
+        VALUES ('delete', old.rowid, old.session_id, old.user_id);
+        INSERT INTO {SESSION_FTS_TABLE}(rowid, session_id, user_id) VALUES (new.rowid, new.session_id, new.user_id);
+    END""",
+    f"INSERT INTO {SESSION_FTS_TABLE}({SESSION_FTS_TABLE}) VALUES ('rebuild')",
+)
+
+# Database files whose session search index is ready (True) or unsupported (False)
+_session_fts_state: dict = {}
+
+
+def _ensure_session_fts(db_file: str) -> bool:
+    """
+    Create the session search index on first use.
+    
+    Returns:
+        True if searches can use SESSION_FTS_TABLE
+    """
+    state = _session_fts_state.get(db_file)
+    if state is not None:
+        return state
+    conn = _get_sqlite_connection(db_file)
+    with _sqlite_write_lock:
+        tables = {
+            row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE name IN (?, ?)", (SESSION_TABLE, SESSION_FTS_TABLE)
+            )
+        }
+        if SESSION_TABLE not in tables:
+            return False  # Not created yet; try again on the next search
+        if SESSION_FTS_TABLE in tables:
+            _session_fts_state[db_file] = True
+            return True
+        try:
+            with conn:
+                for statement in SESSION_FTS_SETUP:
+                    conn.execute(statement)
+            _session_fts_state[db_file] = True
+        except sqlite3.Error as e:
+            # e.g. SQLite built without FTS5 or older than 3.34 (no trigram tokenizer)
+            logger.warning("⚠️ Không tạo được chỉ mục tìm kiếm session, dùng LIKE: %s", e)
+            _session_fts_state[db_file] = False
+    return _session_fts_state[db_file]
+
+
+def _session_index_filter(db_file: str, search: Optional[str]) -> tuple[str, list]:
+    """WHERE clause and parameters shared by the session index queries"""
+    where = "session_type = ?"
+    params: list = ["agent"]
+    if not search:
+        return where, params
+    if len(search) >= SESSION_FTS_MIN_TERM and _ensure_session_fts(db_file):
+        where += f" AND rowid IN (SELECT rowid FROM {SESSION_FTS_TABLE} WHERE {SESSION_FTS_TABLE} MATCH ?)"
+        params.append('"' + search.replace('"', '""') + '"')
+    else:
+        where += " AND (session_id LIKE ? ESCAPE '\\' OR user_id LIKE ? ESCAPE '\\')"
+        pattern = _like_pattern(search)
+        params += [pattern, pattern]
+    return where, params
+
+
+def get_session_index(
+    db_file: str = "tmp/recruitment_db.db",
+    search: Optional[str] = None,
+    order: str = "desc",
+    limit: int = -1,
+    offset: int = 0,
+) -> tuple[list, int]:
+    """
+    List agent sessions (id, user, created_at, preview, msg_count) straight from SQLite.
+    
+    Search, sort and paging run in SQL, and previews come from the summary
+    columns, so the HR list view never loads runs or messages. The number of
+    matching sessions comes back from the same query via COUNT(*) OVER().
+    Open a conversation with fetch_messages_bulk.
+    
+    Args:
+        db_file: Path to SQLite database for session storage
+        search: Case-insensitive substring matched against session_id or user_id
+        order: "desc" for newest first, "asc" for oldest first
+        limit: Maximum number of rows (-1 for no limit)
+        offset: Number of rows to skip
+    
+    Returns:
+        Tuple of (list of SessionRow without runs, total matching sessions;
+        0 when the page is empty)
+    """
+    direction = "ASC" if order.lower() == "asc" else "DESC"
+    where, params = _session_index_filter(db_file, search)
+    sql = (
+        f"SELECT session_id, user_id, created_at, preview, msg_count, COUNT(*) OVER()"
+        f" FROM {SESSION_TABLE} WHERE {where}"
+        f" ORDER BY created_at {direction} LIMIT ? OFFSET ?"
+    )
+    
+    if not ensure_session_summaries(db_file):
+        return [], 0
+    try:
+        rows = _get_sqlite_connection(db_file).execute(sql, params + [limit, offset]).fetchall()
+    except sqlite3.Error:
+        logger.exception("Error listing sessions")
+        return [], 0
+    sessions = [
+        SessionRow(
+            session_id=session_id,
+            user_id=user_id,
+            created_at=created_at,
+            preview=preview or "",
+            msg_count=msg_count or 0,
+        )
+        for session_id, user_id, created_at, preview, msg_count, _ in rows
+    ]
+    return sessions, rows[0][5] if rows else 0
+
+
+def count_sessions(db_file: str = "tmp/recruitment_db.db", search: Optional[str] = None) -> int:
+    """
+    Count agent sessions matching search (same filter as get_session_index).
+    
+    Args:
+        db_file: Path to SQLite database for session storage
+        search: Case-insensitive substring matched against session_id or user_id
+    
+    Returns:
+        Number of matching sessions (0 on error)
+    """
+    where, params = _session_index_filter(db_file, search)
+    try:
+        return _get_sqlite_connection(db_file).execute(
+            f"SELECT COUNT(*) FROM {SESSION_TABLE} WHERE {where}", params
+        ).fetchone()[0]
+    except sqlite3.Error:
+        logger.exception("Error counting sessions")
+        return 0
+
+
+# Stay under SQLite's default 999 bound-parameter limit per statement
+SQLITE_MAX_PARAMS = 900
+
+SESSION_MESSAGES_QUERY = f"""
+    SELECT s.session_id, json_extract(m.value, '$.role'), json_extract(m.value, '$.content')
+    FROM {SESSION_TABLE} AS s, json_each(s.runs) AS r, json_each(r.value, '$.messages') AS m
+    WHERE s.session_id IN ({{placeholders}})
+      AND json_extract(m.value, '$.role') IN ('user', 'assistant')
+    ORDER BY s.session_id, r.key, m.key
+"""
+
+
+def fetch_messages_bulk(db_file: str, session_ids) -> dict:
+    """
+    Load user/assistant messages for several sessions with one IN query per chunk.
+    
+    Messages are read from the stored runs JSON in SQL, so no session is
+    deserialized into agno objects.
+    
+    Args:
+        db_file: Path to SQLite database for session storage
+        session_ids: Session IDs to load
+    
+    Returns:
+        Dict mapping each requested session_id to a list of SessionMessage
+    """
+    session_ids = list(dict.fromkeys(session_ids))
+    messages = {session_id: [] for session_id in session_ids}
+    conn = _get_sqlite_connection(db_file)
+    try:
+        for start in range(0, len(session_ids), SQLITE_MAX_PARAMS):
+            chunk = session_ids[start:start + SQLITE_MAX_PARAMS]
+            sql = SESSION_MESSAGES_QUERY.format(placeholders=", ".join("?" * len(chunk)))
+            for session_id, role, content in conn.execute(sql, chunk):
+                messages[session_id].append(SessionMessage(role=role, content=content or ""))
+    except sqlite3.Error:
+        logger.exception("Error loading session messages")
+    return messages
@@ -2,24 +2,57 @@
 import os
 import uuid
 import logging
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
 import streamlit as st
 from dotenv import load_dotenv
 from agent import create_recruitment_agent
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,  # Changed to DEBUG for more detailed logs
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('tmp/app.log')
-    ]
-)
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
-logger.info("Environment variables loaded")
+LOG_FILE = "tmp/app.log"
+
+STATIC_DIR = Path(__file__).parent / "static"
+
+# Suggested first questions (icon, question); their answers are prerendered
+# into the agent's response cache at startup
+SUGGESTED_QUESTIONS = (
+    ("📋", "Quy trình tuyển dụng là gì?"),
+    ("🔍", "Có vị trí nào đang tuyển?"),
+    ("💼", "Tôi muốn tìm việc Python Developer"),
+    ("📝", "Cần chuẩn bị gì cho phỏng vấn?"),
+)
+
+
+@st.cache_data
+def load_css(path: Path) -> str:
+    """Read a stylesheet and return it as a minified <style> tag"""
+    css = path.read_text(encoding="utf-8")
+    return f"<style>{' '.join(css.split())}</style>"
+
+
+def setup_logging() -> None:
+    """Configure root logging once per process (Streamlit reruns the script on every interaction)"""
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    os.makedirs("tmp", exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,  # Changed to DEBUG for more detailed logs
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(),
+            RotatingFileHandler(LOG_FILE, maxBytes=10_000_000, backupCount=3, encoding="utf-8"),
+        ]
+    )
+
+
+@st.cache_resource
+def load_environment() -> None:
+    """Load environment variables from .env once per process"""
+    load_dotenv()
+    logger.info("Environment variables loaded")
+
 
 # Page configuration
 st.set_page_config(
@@ -29,62 +62,50 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: bold;
-        color: #1f77b4;
-        text-align: center;
-        margin-bottom: 1rem;
-    }
-    .sub-header {
-        font-size: 1.2rem;
-        color: #666;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .chat-message {
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin-bottom: 1rem;
-    }
-    .user-message {
-        background-color: #e3f2fd;
-        margin-left: 2rem;
-    }
-    .assistant-message {
-        background-color: #f5f5f5;
-        margin-right: 2rem;
-    }
-    .stButton>button {
-        width: 100%;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Custom CSS, minified once per process and reused on every rerun
+st.markdown(load_css(STATIC_DIR / "app.css"), unsafe_allow_html=True)
 
 
 @st.cache_resource
-def initialize_agent():
-    """Initialize and cache the recruitment agent"""
+def initialize_agent(
+    model_id: str,
+    provider: str,
+    db_file: str,
+    lancedb_path: str,
+    use_google_sheets: bool,
+):
+    """Initialize and cache the recruitment agent (one instance per configuration)"""
     logger.info("🔄 Khởi tạo chatbot agent...")
-    use_google_sheets = os.getenv("USE_GOOGLE_SHEETS", "true").lower() == "true"
     agent = create_recruitment_agent(
-        db_file=os.getenv("DB_FILE", "tmp/recruitment_db.db"),
-        lancedb_path=os.getenv("LANCEDB_PATH", "tmp/lancedb"),
+        model_id=model_id,
+        provider=provider,
+        db_file=db_file,
+        lancedb_path=lancedb_path,
         use_google_sheets=use_google_sheets,
+        suggested_questions=tuple(question for _, question in SUGGESTED_QUESTIONS),
     )
     logger.info("✅ Chatbot agent đã được khởi tạo thành công")
     return agent
 
 
+def get_agent():
+    """Get the cached agent for the configuration in the environment"""
+    return initialize_agent(
+        model_id=os.getenv("MODEL_ID", "gemini-2.5-flash"),
+        provider=os.getenv("MODEL_PROVIDER", "gemini"),
+        db_file=os.getenv("DB_FILE", "tmp/recruitment_db.db"),
+        lancedb_path=os.getenv("LANCEDB_PATH", "tmp/lancedb"),
+        use_google_sheets=os.getenv("USE_GOOGLE_SHEETS", "true").lower() == "true",
+    )
+
+
 def initialize_session_state():
     """Initialize Streamlit session state"""
     # Initialize agent - always get from cache or create new
     # Agent is cached, so knowledge base is only loaded once
     if "agent" not in st.session_state:
-        st.session_state.agent = initialize_agent()
+        with st.spinner("🔄 Đang khởi tạo chatbot..."):
+            st.session_state.agent = get_agent()
         # NOTE: Removed automatic reload_knowledge() to improve performance
         # Knowledge base is loaded once when agent is initialized and cached
         # Use manual reload button in sidebar if you need to refresh data
@@ -136,6 +157,34 @@ def send_greeting():
         st.session_state.conversation_started = True
 
 
+def stream_agent_text(user_input: str):
+    """
+    Yield the agent's answer as text chunks, for st.write_stream.
+    
+    Uses the synchronous chat() stream: every Streamlit turn would otherwise
+    run on a new event loop, while the cached Agent's model keeps its async
+    HTTP client (bound to the first loop) between turns.
+    
+    Args:
+        user_input: User message
+    """
+    response = st.session_state.agent.chat(
+        message=user_input,
+        user_id=st.session_state.user_id,
+        session_id=st.session_state.session_id,
+        stream=True,
+    )
+    for chunk in response:
+        # Handle different chunk formats
+        content = getattr(chunk, 'content', None)
+        if isinstance(content, str):
+            yield content
+        elif isinstance(chunk, str):
+            yield chunk
+        elif hasattr(chunk, 'text'):
+            yield chunk.text
+
+
 def handle_user_input(user_input: str):
     """Handle user input and get agent response"""
     # Add user message to chat history
@@ -153,43 +202,12 @@ def handle_user_input(user_input: str):
         message_placeholder = st.empty()
         
         try:
-            # Use streaming for faster perceived response time
-            response = st.session_state.agent.chat(
-                message=user_input,
-                user_id=st.session_state.user_id,
-                session_id=st.session_state.session_id,
-            )
-            
-            # Stream the response
-            assistant_message = ""
-            try:
-                # Try to iterate over response chunks
-                for chunk in response:
-                    # Handle different chunk formats
-                    if hasattr(chunk, 'content') and chunk.content:
-                        assistant_message += chunk.content
-                    elif isinstance(chunk, str):
-                        assistant_message += chunk
-                    elif hasattr(chunk, 'text'):
-                        assistant_message += chunk.text
-                    
-                    # Update UI with streaming cursor
-                    if assistant_message:
-                        message_placeholder.markdown(assistant_message + "▌")
-            except (TypeError, AttributeError):
-                # If response is not iterable, treat as single response
-                if hasattr(response, 'content'):
-                    assistant_message = response.content
-                elif isinstance(response, str):
-                    assistant_message = response
-                else:
-                    assistant_message = str(response)
-                message_placeholder.markdown(assistant_message)
+            # Streamlit appends chunks as they arrive and returns the full text
+            assistant_message = st.write_stream(stream_agent_text(user_input), cursor="▌")
+            if not isinstance(assistant_message, str):
+                assistant_message = "".join(map(str, assistant_message))
             
-            # Final message without cursor
-            if assistant_message:
-                message_placeholder.markdown(assistant_message)
-            else:
+            if not assistant_message:
                 message_placeholder.markdown("⚠️ Không nhận được phản hồi từ chatbot.")
             
             # Add assistant message to chat history
@@ -210,12 +228,10 @@ def handle_user_input(user_input: str):
 
 def main():
     """Main application"""
-    # Initialize agent early to ensure it's ready
-    if "agent" not in st.session_state:
-        with st.spinner("🔄 Đang khởi tạo chatbot..."):
-            st.session_state.agent = initialize_agent()
+    setup_logging()
+    load_environment()
     
-    # Initialize session state
+    # Initialize session state (including the cached agent)
     initialize_session_state()
     
     # Header
@@ -284,25 +300,12 @@ def main():
     
     # Show suggested questions if no messages yet (only greeting)
     if len(st.session_state.messages) <= 1:
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            if st.button("📋 Quy trình tuyển dụng là gì?", use_container_width=True, key="q1"):
-                handle_user_input("Quy trình tuyển dụng là gì?")
-                st.rerun()
-            
-            if st.button("💼 Tôi muốn tìm việc Python Developer", use_container_width=True, key="q3"):
-                handle_user_input("Tôi muốn tìm việc Python Developer")
-                st.rerun()
-        
-        with col2:
-            if st.button("🔍 Có vị trí nào đang tuyển?", use_container_width=True, key="q2"):
-                handle_user_input("Có vị trí nào đang tuyển?")
-                st.rerun()
-            
-            if st.button("📝 Cần chuẩn bị gì cho phỏng vấn?", use_container_width=True, key="q4"):
-                handle_user_input("Cần chuẩn bị gì cho phỏng vấn?")
-                st.rerun()
+        columns = st.columns(2)
+        for index, (icon, question) in enumerate(SUGGESTED_QUESTIONS):
+            with columns[index % 2]:
+                if st.button(f"{icon} {question}", use_container_width=True, key=f"q{index + 1}"):
+                    handle_user_input(question)
+                    st.rerun()
     
     # Chat input
     if prompt := st.chat_input("Nhập tin nhắn của bạn..."):
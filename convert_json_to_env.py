@@ -7,18 +7,28 @@ Sử dụng: python convert_json_to_env.py [path_to_json_file]
 import json
 import sys
 import os
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # orjson là tùy chọn, không có thì dùng json chuẩn
+    orjson = None
 
 
 def convert_json_to_env(json_file_path):
     """Đọc file JSON và xuất ra format .env"""
     
     try:
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        raw = Path(json_file_path).read_bytes()
+        # orjson.JSONDecodeError kế thừa json.JSONDecodeError nên except bên dưới vẫn bắt được
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
         
-        print("# Google Sheets Credentials - Generated from JSON")
-        print("# Copy các dòng dưới đây vào file .env của bạn\n")
-        print("# ============================================")
+        # Gom toàn bộ output rồi ghi ra stdout một lần
+        out = [
+            "# Google Sheets Credentials - Generated from JSON",
+            "# Copy các dòng dưới đây vào file .env của bạn\n",
+            "# ============================================",
+        ]
         
         # Map từ JSON keys sang ENV variable names
         mapping = {
@@ -41,44 +51,49 @@ def convert_json_to_env(json_file_path):
                 # Xử lý private_key đặc biệt (cần giữ \n và đặt trong dấu ngoặc kép)
                 if json_key == "private_key":
                     # Đảm bảo giữ nguyên \n trong private key
-                    print(f'{env_key}="{value}"')
+                    out.append(f'{env_key}="{value}"')
                 else:
                     # Các giá trị khác
-                    print(f'{env_key}={value}')
+                    out.append(f'{env_key}={value}')
         
         # Thêm universe_domain nếu có, nếu không thì dùng mặc định
         if "universe_domain" in data:
-            print(f'GOOGLE_SHEETS_CREDENTIALS_UNIVERSE_DOMAIN={data["universe_domain"]}')
+            out.append(f'GOOGLE_SHEETS_CREDENTIALS_UNIVERSE_DOMAIN={data["universe_domain"]}')
         else:
-            print('GOOGLE_SHEETS_CREDENTIALS_UNIVERSE_DOMAIN=googleapis.com')
+            out.append('GOOGLE_SHEETS_CREDENTIALS_UNIVERSE_DOMAIN=googleapis.com')
         
-        print("\n# ============================================")
-        print("# Các biến cấu hình khác (cần điền thủ công)")
-        print("# ============================================")
-        print("GOOGLE_SHEETS_SPREADSHEET_ID=your-spreadsheet-id-here")
-        print("KNOWLEDGE_BASE_SHEET_ID=Knowledge")
-        print("JOB_SHEET_ID=Jobs")
-        print("INFO_SHEET_ID=UserInfo")
+        out += [
+            "\n# ============================================",
+            "# Các biến cấu hình khác (cần điền thủ công)",
+            "# ============================================",
+            "GOOGLE_SHEETS_SPREADSHEET_ID=your-spreadsheet-id-here",
+            "KNOWLEDGE_BASE_SHEET_ID=Knowledge",
+            "JOB_SHEET_ID=Jobs",
+            "INFO_SHEET_ID=UserInfo",
+        ]
         
-        print("\n# ============================================")
-        print("# HƯỚNG DẪN:")
-        print("# 1. Copy toàn bộ output trên vào file .env")
-        print("# 2. Thay 'your-spreadsheet-id-here' bằng Spreadsheet ID thật")
-        print("# 3. Cài đặt python-dotenv: pip install python-dotenv")
-        print("# 4. Load .env trong code: from dotenv import load_dotenv; load_dotenv()")
-        print("# 5. Test thử xem có hoạt động không")
-        print("# ============================================\n")
+        out += [
+            "\n# ============================================",
+            "# HƯỚNG DẪN:",
+            "# 1. Copy toàn bộ output trên vào file .env",
+            "# 2. Thay 'your-spreadsheet-id-here' bằng Spreadsheet ID thật",
+            "# 3. Cài đặt python-dotenv: pip install python-dotenv",
+            "# 4. Load .env trong code: from dotenv import load_dotenv; load_dotenv()",
+            "# 5. Test thử xem có hoạt động không",
+            "# ============================================\n",
+        ]
         
+        sys.stdout.write("\n".join(out) + "\n")
         return True
         
     except FileNotFoundError:
-        print(f"❌ Lỗi: Không tìm thấy file {json_file_path}")
+        print(f"❌ Lỗi: Không tìm thấy file {json_file_path}", file=sys.stderr)
         return False
     except json.JSONDecodeError:
-        print(f"❌ Lỗi: File {json_file_path} không phải là JSON hợp lệ")
+        print(f"❌ Lỗi: File {json_file_path} không phải là JSON hợp lệ", file=sys.stderr)
         return False
     except Exception as e:
-        print(f"❌ Lỗi: {str(e)}")
+        print(f"❌ Lỗi: {str(e)}", file=sys.stderr)
         return False
 
 
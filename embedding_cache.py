@@ -0,0 +1,158 @@
+"""Persistent embedding cache for Recruitment Chatbot"""
+import hashlib
+import logging
+import sqlite3
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from agno.knowledge.embedder.openai import OpenAIEmbedder
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text before hashing it into a cache key.
+
+    NFC composes Vietnamese diacritics typed as combining marks, so the same
+    word always hashes the same; whitespace is collapsed.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+@dataclass
+class CachedOpenAIEmbedder(OpenAIEmbedder):
+    """
+    OpenAIEmbedder that remembers embeddings in memory and in a SQLite file.
+
+    Knowledge rows re-embedded on reload and repeated prompts are served
+    without an API round-trip; the most recent entries are preloaded on start.
+    """
+
+    cache_file: str = "tmp/emb_cache.db"
+    max_memory_entries: int = 4096
+
+    def __post_init__(self):
+        super().__post_init__()
+        self._memory: "OrderedDict[str, array]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        try:
+            Path(self.cache_file).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.cache_file, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._conn.commit()
+            self._warm()
+        except sqlite3.Error as e:
+            logger.warning("⚠️ Embedding cache disabled on disk (%s): %s", self.cache_file, e)
+            self._conn = None
+
+    def _warm(self) -> None:
+        """Preload the most recently stored embeddings into memory"""
+        rows = self._conn.execute(
+            "SELECT key, vector FROM embeddings ORDER BY rowid DESC LIMIT ?",
+            (self.max_memory_entries,),
+        ).fetchall()
+        for key, blob in reversed(rows):
+            self._memory[key] = array("f", blob)
+        logger.info("✅ Warmed embedding cache with %d entries", len(rows))
+
+    def _key(self, text: str) -> str:
+        """Cache key for text under this model and dimension"""
+        raw = f"{self.id}:{self.dimensions}:{normalize_text(text)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _get(self, key: str) -> Optional[List[float]]:
+        """Cached embedding for key, or None"""
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                return vector.tolist()
+            if self._conn is None:
+                return None
+            row = self._conn.execute("SELECT vector FROM embeddings WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            vector = array("f", row[0])
+            self._remember(key, vector)
+            return vector.tolist()
+
+    def _remember(self, key: str, vector: array) -> None:
+        """Keep vector in the in-memory LRU (lock held)"""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _put_many(self, items: List[Tuple[str, List[float]]]) -> None:
+        """Cache embeddings; failed (empty) embeddings are skipped"""
+        rows = [(key, array("f", embedding)) for key, embedding in items if embedding]
+        if not rows:
+            return
+        with self._lock:
+            for key, vector in rows:
+                self._remember(key, vector)
+            if self._conn is None:
+                return
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [(key, vector.tobytes()) for key, vector in rows],
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning("⚠️ Could not persist embeddings: %s", e)
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.get_embedding_and_usage(text)[0]
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        key = self._key(text)
+        cached = self._get(key)
+        if cached is not None:
+            return cached, None
+        embedding, usage = super().get_embedding_and_usage(text)
+        self._put_many([(key, embedding)])
+        return embedding, usage
+
+    async def async_get_embedding(self, text: str) -> List[float]:
+        return (await self.async_get_embedding_and_usage(text))[0]
+
+    async def async_get_embedding_and_usage(self, text: str):
+        key = self._key(text)
+        cached = self._get(key)
+        if cached is not None:
+            return cached, None
+        embedding, usage = await super().async_get_embedding_and_usage(text)
+        self._put_many([(key, embedding)])
+        return embedding, usage
+
+    async def async_get_embeddings_batch_and_usage(
+        self, texts: List[str]
+    ) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        """Embed only the texts missing from the cache, in batches"""
+        keys = [self._key(text) for text in texts]
+        embeddings: List[Optional[List[float]]] = [self._get(key) for key in keys]
+        usages: List[Optional[Dict]] = [None] * len(texts)
+
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            new_embeddings, new_usages = await super().async_get_embeddings_batch_and_usage(
+                [texts[i] for i in missing]
+            )
+            for i, embedding, usage in zip(missing, new_embeddings, new_usages):
+                embeddings[i] = embedding
+                usages[i] = usage
+            self._put_many([(keys[i], embeddings[i]) for i in missing])
+        logger.debug("Embedding cache: %d/%d texts served from cache", len(texts) - len(missing), len(texts))
+        return embeddings, usages
@@ -1,18 +1,224 @@
 """Google Sheets Data Loader for Recruitment Chatbot"""
 import os
+import json
 import logging
-from typing import Optional, List, Dict, Any
-import gspread
-from google.oauth2.service_account import Credentials
-import pandas as pd
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Mapping
+from tenacity import (
+    before_sleep_log,
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib json module
+    orjson = None
+
+# gspread, google-auth, requests/urllib3 and pandas are imported where they are
+# used: when the CSV and JSON caches are fresh a process never needs them, and
+# they cost hundreds of milliseconds (pandas alone tens of MB) to import
+if TYPE_CHECKING:
+    import gspread
+    import pandas as pd
+    from google.auth.transport.requests import AuthorizedSession
+    from google.oauth2.service_account import Credentials
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Knowledge and jobs are fetched together in one values.batchGet request; the
+# result is shared for this many seconds so the knowledge base and jobs tool,
+# which load in parallel on startup, don't each hit the API. Callers that saw a
+# newer Drive modifiedTime than the cached values, or force a reload, refetch
+SHEET_VALUES_TTL = 60
+
+# Keep-alive pool for sheets.googleapis.com; dropped connections are retried here,
+# rate limits and server errors by _with_retry below
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 10
+HTTP_RETRY_TOTAL = 3
+HTTP_RETRY_BACKOFF = 0.3
+
+# Sheets API statuses worth retrying (rate limit / transient server errors)
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """True for Sheets API errors that usually succeed when retried"""
+    from gspread.exceptions import APIError
+    return isinstance(exc, APIError) and exc.response.status_code in RETRYABLE_STATUS_CODES
+
+
+# Wraps individual Sheets API calls (not whole loaders, so bugs aren't retried)
+_with_retry = retry(
+    wait=wait_exponential_jitter(initial=0.5, max=8),
+    stop=stop_after_attempt(5),
+    retry=retry_if_exception(_is_retryable),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True,
+)
+
+SCOPES = (
+    'https://spreadsheets.google.com/feeds',
+    'https://www.googleapis.com/auth/drive',
+)
+
+# Authorized clients keyed by service account, shared by every loader so the
+# credentials (JWT signer) and the pooled session are set up once per process
+_CLIENT_CACHE: Dict[str, "gspread.Client"] = {}
+_client_lock = threading.Lock()
+# Opened spreadsheets by id: open_by_key costs a metadata request each time
+_SPREADSHEET_CACHE: Dict[str, "gspread.Spreadsheet"] = {}
+# Statuses after which a cached spreadsheet handle is dropped
+AUTH_ERROR_STATUS_CODES = frozenset({401, 403})
+
+
+@dataclass(frozen=True)
+class SheetsConfig:
+    """Google Sheets settings from the environment"""
+    credentials_file: Optional[str]
+    spreadsheet_id: Optional[str]
+    knowledge_sheet_name: str
+    job_sheet_name: str
+    user_info_sheet_name: str
+
+
+@lru_cache(maxsize=1)
+def _get_sheets_config() -> SheetsConfig:
+    """Read the sheet settings once per process (after .env has been loaded)"""
+    return SheetsConfig(
+        credentials_file=os.getenv("GOOGLE_SHEETS_CREDENTIALS_FILE"),
+        spreadsheet_id=os.getenv("GOOGLE_SHEETS_SPREADSHEET_ID"),
+        knowledge_sheet_name=os.getenv("KNOWLEDGE_BASE_SHEET_ID", "Knowledge"),
+        job_sheet_name=os.getenv("JOB_SHEET_ID", "Jobs"),
+        user_info_sheet_name=os.getenv("INFO_SHEET_ID", "UserInfo"),
+    )
+
+
+# (credentials key, environment variable, default) of the service account info
+_ENV_MAP = (
+    ("type", "GOOGLE_SHEETS_CREDENTIALS_TYPE", None),
+    ("project_id", "GOOGLE_SHEETS_CREDENTIALS_PROJECT_ID", None),
+    ("private_key_id", "GOOGLE_SHEETS_CREDENTIALS_PRIVATE_KEY_ID", None),
+    ("private_key", "GOOGLE_SHEETS_CREDENTIALS_PRIVATE_KEY", ""),
+    ("client_email", "GOOGLE_SHEETS_CREDENTIALS_CLIENT_EMAIL", None),
+    ("client_id", "GOOGLE_SHEETS_CREDENTIALS_CLIENT_ID", None),
+    ("auth_uri", "GOOGLE_SHEETS_CREDENTIALS_AUTH_URI", None),
+    ("token_uri", "GOOGLE_SHEETS_CREDENTIALS_TOKEN_URI", None),
+    ("auth_provider_x509_cert_url", "GOOGLE_SHEETS_CREDENTIALS_AUTH_PROVIDER_X509_CERT_URL", None),
+    ("client_x509_cert_url", "GOOGLE_SHEETS_CREDENTIALS_CLIENT_X509_CERT_URL", None),
+    ("universe_domain", "GOOGLE_SHEETS_CREDENTIALS_UNIVERSE_DOMAIN", "googleapis.com"),
+)
+
+
+@lru_cache(maxsize=1)
+def _get_credentials_from_env() -> Mapping[str, Optional[str]]:
+    """Build credentials dict from environment variables (once per process, read-only)"""
+    env = os.environ
+    creds = {key: env.get(var, default) for key, var, default in _ENV_MAP}
+    creds["private_key"] = creds["private_key"].replace("\\n", "\n")
+    return MappingProxyType(creds)
+
+
+def _sheet_cache_meta_file(cache_file: str) -> str:
+    """Sidecar file remembering which spreadsheet version a local cache file holds"""
+    return f"{os.path.splitext(cache_file)[0]}.cache.json"
+
+
+def read_cached_modified(cache_file: str) -> str:
+    """Spreadsheet modifiedTime the cache file was built from ("" if unknown)"""
+    try:
+        with open(_sheet_cache_meta_file(cache_file), "r", encoding="utf-8") as f:
+            return json.load(f).get("modifiedTime", "")
+    except (OSError, ValueError):
+        return ""
+
+
+def write_cached_modified(cache_file: str, modified: str) -> None:
+    """Remember the spreadsheet modifiedTime the cache file was built from"""
+    try:
+        with open(_sheet_cache_meta_file(cache_file), "w", encoding="utf-8") as f:
+            json.dump({"modifiedTime": modified}, f)
+    except OSError as e:
+        logger.warning("[GOOGLE SHEETS LOADER] Could not write cache metadata: %s", e)
+
+
+# Directories already created by this process (skips a stat+mkdir per save)
+_DIRS_ENSURED: set = set()
+
+
+def ensure_dir(path: str) -> None:
+    """Create directory path (and parents) once per process; "" means the current directory"""
+    if path and path not in _DIRS_ENSURED:
+        os.makedirs(path, exist_ok=True)
+        _DIRS_ENSURED.add(path)
+
+
+# Job fields, in jobs.json order, and the ones holding comma- or newline-separated lists
+JOB_FIELDS = (
+    "id", "title", "location", "type", "salary", "description",
+    "skills", "requirements", "benefits", "contact",
+)
+JOB_LIST_FIELDS = ("skills", "requirements", "benefits")
+
+
+def _parse_list_column(values: "pd.Series") -> "pd.Series":
+    """
+    Parse a column of comma-separated or newline-separated strings into lists.
+    
+    A cell containing a comma is split on commas only (its newlines stay inside
+    the items); other cells are split on newlines. Splitting, stripping and
+    dropping empty items run as pandas string ops on the whole column instead
+    of a Python loop per cell.
+    
+    Args:
+        values: Column of raw cell values
+    
+    Returns:
+        Series of lists of strings, aligned with values
+    """
+    texts = values.fillna("").astype(str)
+    # Newline-separated cells are turned into comma-separated ones, so one split covers both
+    has_comma = texts.str.contains(",", regex=False)
+    texts = texts.where(has_comma, texts.str.replace("\n", ",", regex=False))
+    items = texts.str.split(",").explode().str.strip()
+    items = items[items != ""]
+    parsed = items.groupby(level=0).agg(list).reindex(values.index)
+    return parsed.apply(lambda item_list: item_list if isinstance(item_list, list) else [])
+
+
+def _values_to_dataframe(values: List[List[Any]]) -> "pd.DataFrame":
+    """
+    Build a DataFrame from raw sheet values (first row is the header).
+    
+    The API drops trailing empty cells, so short rows are padded with "" the
+    same way get_all_records() does.
+    """
+    import pandas as pd
+    
+    header, rows = values[0], values[1:]
+    df = pd.DataFrame(rows, dtype=object).reindex(columns=range(len(header))).fillna("")
+    df.columns = header
+    return df
+
 
 class GoogleSheetsLoader:
     """Load data from Google Sheets"""
     
+    # spreadsheet_id -> (fetched_at, modified_time, {sheet_name: values}), shared by
+    # all loaders; modified_time is the version the fetching caller had seen (or None)
+    _values_cache: Dict[str, tuple] = {}
+    # One lock per spreadsheet serializes its fetches; _values_lock only guards the dicts
+    _fetch_locks: Dict[str, threading.Lock] = {}
+    _values_lock = threading.Lock()
+    
     def __init__(
         self,
         credentials_file: Optional[str] = None,
@@ -31,11 +237,12 @@ class GoogleSheetsLoader:
             job_sheet_name: Tên tab/sheet chứa jobs (default: "Jobs")
             user_info_sheet_name: Tên tab/sheet chứa user info (default: "UserInfo")
         """
-        self.credentials_file = credentials_file or os.getenv("GOOGLE_SHEETS_CREDENTIALS_FILE")
-        self.spreadsheet_id = spreadsheet_id or os.getenv("GOOGLE_SHEETS_SPREADSHEET_ID")
-        self.knowledge_sheet_name = knowledge_sheet_name or os.getenv("KNOWLEDGE_BASE_SHEET_ID", "Knowledge")
-        self.job_sheet_name = job_sheet_name or os.getenv("JOB_SHEET_ID", "Jobs")
-        self.user_info_sheet_name = user_info_sheet_name or os.getenv("INFO_SHEET_ID", "UserInfo")
+        config = _get_sheets_config()
+        self.credentials_file = credentials_file or config.credentials_file
+        self.spreadsheet_id = spreadsheet_id or config.spreadsheet_id
+        self.knowledge_sheet_name = knowledge_sheet_name or config.knowledge_sheet_name
+        self.job_sheet_name = job_sheet_name or config.job_sheet_name
+        self.user_info_sheet_name = user_info_sheet_name or config.user_info_sheet_name
         
         logger.info("[GOOGLE SHEETS LOADER] Initialized with:")
         logger.info("[GOOGLE SHEETS LOADER]   - Credentials file: %s", self.credentials_file)
@@ -46,49 +253,38 @@ class GoogleSheetsLoader:
         
         self._client = None
     
-    def _get_credentials_from_env(self):
-        """Build credentials dict from environment variables"""
-        return {
-            "type": os.getenv("GOOGLE_SHEETS_CREDENTIALS_TYPE"),
-            "project_id": os.getenv("GOOGLE_SHEETS_CREDENTIALS_PROJECT_ID"),
-            "private_key_id": os.getenv("GOOGLE_SHEETS_CREDENTIALS_PRIVATE_KEY_ID"),
-            "private_key": os.getenv("GOOGLE_SHEETS_CREDENTIALS_PRIVATE_KEY", "").replace("\\n", "\n"),
-            "client_email": os.getenv("GOOGLE_SHEETS_CREDENTIALS_CLIENT_EMAIL"),
-            "client_id": os.getenv("GOOGLE_SHEETS_CREDENTIALS_CLIENT_ID"),
-            "auth_uri": os.getenv("GOOGLE_SHEETS_CREDENTIALS_AUTH_URI"),
-            "token_uri": os.getenv("GOOGLE_SHEETS_CREDENTIALS_TOKEN_URI"),
-            "auth_provider_x509_cert_url": os.getenv("GOOGLE_SHEETS_CREDENTIALS_AUTH_PROVIDER_X509_CERT_URL"),
-            "client_x509_cert_url": os.getenv("GOOGLE_SHEETS_CREDENTIALS_CLIENT_X509_CERT_URL"),
-            "universe_domain": os.getenv("GOOGLE_SHEETS_CREDENTIALS_UNIVERSE_DOMAIN", "googleapis.com")
-        }
-    
     def _get_client(self):
         """Get or create Google Sheets client"""
         if self._client is None:
             try:
-                logger.info("[GOOGLE SHEETS LOADER] Initializing Google Sheets client...")
-                
-                scope = [
-                    'https://spreadsheets.google.com/feeds',
-                    'https://www.googleapis.com/auth/drive'
-                ]
-                
                 # Try to use credentials from environment variables first
-                creds_dict = self._get_credentials_from_env()
+                creds_dict = _get_credentials_from_env()
                 if creds_dict.get("client_email") and creds_dict.get("private_key"):
-                    logger.info("[GOOGLE SHEETS LOADER] Using credentials from environment variables")
-                    creds = Credentials.from_service_account_info(creds_dict, scopes=scope)
-                    self._client = gspread.authorize(creds)
-                    logger.info("[GOOGLE SHEETS LOADER] Google Sheets client initialized successfully with env vars")
-                # Fallback to JSON file if environment variables not set
+                    cache_key = creds_dict["client_email"]
                 elif self.credentials_file and os.path.exists(self.credentials_file):
-                    logger.info("[GOOGLE SHEETS LOADER] Using credentials from JSON file: %s", self.credentials_file)
-                    creds = Credentials.from_service_account_file(self.credentials_file, scopes=scope)
-                    self._client = gspread.authorize(creds)
-                    logger.info("[GOOGLE SHEETS LOADER] Google Sheets client initialized successfully with JSON file")
+                    cache_key = f"file:{os.path.abspath(self.credentials_file)}"
                 else:
                     logger.error("[GOOGLE SHEETS LOADER] No valid credentials found (neither env vars nor JSON file)")
                     raise ValueError("No valid Google Sheets credentials found")
+                
+                with _client_lock:
+                    client = _CLIENT_CACHE.get(cache_key)
+                    if client is None:
+                        import gspread
+                        from google.oauth2.service_account import Credentials
+                        
+                        logger.info("[GOOGLE SHEETS LOADER] Initializing Google Sheets client...")
+                        if not cache_key.startswith("file:"):
+                            logger.info("[GOOGLE SHEETS LOADER] Using credentials from environment variables")
+                            creds = Credentials.from_service_account_info(creds_dict, scopes=SCOPES)
+                        # Fallback to JSON file if environment variables not set
+                        else:
+                            logger.info("[GOOGLE SHEETS LOADER] Using credentials from JSON file: %s", self.credentials_file)
+                            creds = Credentials.from_service_account_file(self.credentials_file, scopes=SCOPES)
+                        client = gspread.authorize(creds, session=self._create_session(creds))
+                        _CLIENT_CACHE[cache_key] = client
+                        logger.info("[GOOGLE SHEETS LOADER] Google Sheets client initialized successfully")
+                self._client = client
                     
             except Exception as e:
                 logger.error("[GOOGLE SHEETS LOADER] Error initializing client: %s", e, exc_info=True)
@@ -96,12 +292,139 @@ class GoogleSheetsLoader:
         
         return self._client
     
-    def load_knowledge_data(self, sheet_name: Optional[str] = None) -> Optional[pd.DataFrame]:
+    @staticmethod
+    def _create_session(creds: "Credentials") -> "AuthorizedSession":
+        """Pooled, retrying HTTP session for creds"""
+        from google.auth.transport.requests import AuthorizedSession
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        session = AuthorizedSession(creds)
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            max_retries=Retry(total=HTTP_RETRY_TOTAL, backoff_factor=HTTP_RETRY_BACKOFF),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    
+    @staticmethod
+    def close_all() -> None:
+        """Close the HTTP sessions of all cached clients (e.g. on shutdown)"""
+        with _client_lock:
+            for client in _CLIENT_CACHE.values():
+                client.http_client.session.close()
+            _CLIENT_CACHE.clear()
+            _SPREADSHEET_CACHE.clear()
+    
+    def _get_spreadsheet(self) -> "gspread.Spreadsheet":
+        """Opened spreadsheet, shared by every loader of the same spreadsheet id"""
+        spreadsheet = _SPREADSHEET_CACHE.get(self.spreadsheet_id)
+        if spreadsheet is None:
+            spreadsheet = _with_retry(self._get_client().open_by_key)(self.spreadsheet_id)
+            with _client_lock:
+                _SPREADSHEET_CACHE[self.spreadsheet_id] = spreadsheet
+        return spreadsheet
+    
+    def _read_values(self, read):
+        """Run read(spreadsheet); an auth error drops the cached handle so the next call reopens it"""
+        from gspread.exceptions import APIError
+        
+        try:
+            return _with_retry(read)(self._get_spreadsheet())
+        except APIError as e:
+            if e.response.status_code in AUTH_ERROR_STATUS_CODES:
+                with _client_lock:
+                    _SPREADSHEET_CACHE.pop(self.spreadsheet_id, None)
+            raise
+    
+    def get_last_modified(self) -> Optional[str]:
+        """
+        Last modification time of the spreadsheet (one lightweight Drive files.get call).
+        
+        Returns:
+            RFC 3339 timestamp such as "2025-01-31T08:00:00.000Z", or None if it can't be read
+        """
+        try:
+            if not self.spreadsheet_id:
+                return None
+            metadata = _with_retry(self._get_client().http_client.get_file_drive_metadata)(self.spreadsheet_id)
+            return metadata.get("modifiedTime")
+        except Exception as e:
+            logger.warning("[GOOGLE SHEETS LOADER] Could not read spreadsheet modified time: %s", e)
+            return None
+    
+    def load_all_sheets(
+        self, modified_time: Optional[str] = None, force: bool = False
+    ) -> Dict[str, List[List[Any]]]:
+        """
+        Fetch the knowledge and jobs tabs in a single values.batchGet request.
+        
+        The result is cached per spreadsheet for SHEET_VALUES_TTL seconds and
+        concurrent callers for the same spreadsheet wait for the in-flight
+        request instead of sending their own.
+        
+        Args:
+            modified_time: Spreadsheet modifiedTime the caller read before loading;
+                cached values from an older (or unknown) version are not served
+            force: Always fetch, ignoring the cache
+        
+        Returns:
+            Dict mapping sheet name to its raw 2D values (header row first)
+        """
+        sheet_names = [self.knowledge_sheet_name, self.job_sheet_name]
+        with self._values_lock:
+            fetch_lock = self._fetch_locks.setdefault(self.spreadsheet_id, threading.Lock())
+        with fetch_lock:
+            cached = self._values_cache.get(self.spreadsheet_id)
+            if (
+                not force
+                and cached
+                and time.monotonic() - cached[0] < SHEET_VALUES_TTL
+                and all(name in cached[2] for name in sheet_names)
+                and (modified_time is None or (cached[1] is not None and cached[1] >= modified_time))
+            ):
+                return cached[2]
+            
+            from gspread.utils import absolute_range_name
+            
+            logger.info("[GOOGLE SHEETS LOADER] Fetching sheets %s in one batch request", sheet_names)
+            ranges = [absolute_range_name(name) for name in sheet_names]
+            response = self._read_values(lambda spreadsheet: spreadsheet.values_batch_get(ranges))
+            sheet_values = {
+                name: value_range.get("values", [])
+                for name, value_range in zip(sheet_names, response.get("valueRanges", []))
+            }
+            with self._values_lock:
+                self._values_cache[self.spreadsheet_id] = (time.monotonic(), modified_time, sheet_values)
+            return sheet_values
+    
+    def _get_sheet_values(
+        self, sheet_name: str, modified_time: Optional[str] = None, force: bool = False
+    ) -> List[List[Any]]:
+        """Raw values of sheet_name, from the shared batch when it covers that sheet"""
+        sheet_values = self.load_all_sheets(modified_time=modified_time, force=force)
+        if sheet_name in sheet_values:
+            return sheet_values[sheet_name]
+        from gspread.utils import absolute_range_name
+        
+        response = self._read_values(lambda spreadsheet: spreadsheet.values_get(absolute_range_name(sheet_name)))
+        return response.get("values", [])
+    
+    def load_knowledge_data(
+        self,
+        sheet_name: Optional[str] = None,
+        modified_time: Optional[str] = None,
+        force: bool = False,
+    ) -> Optional["pd.DataFrame"]:
         """
         Load recruitment knowledge data from Google Sheets.
         
         Args:
             sheet_name: Tên tab/sheet (default: dùng giá trị từ __init__)
+            modified_time: Spreadsheet modifiedTime read before loading (see load_all_sheets)
+            force: Fetch the rows even if recently cached
         
         Returns:
             DataFrame with columns: Question, Answer, Category
@@ -117,27 +440,23 @@ class GoogleSheetsLoader:
             logger.info("[GOOGLE SHEETS LOADER] Loading knowledge data from spreadsheet: %s, sheet: %s", 
                        self.spreadsheet_id, sheet_name)
             
-            client = self._get_client()
-            spreadsheet = client.open_by_key(self.spreadsheet_id)
-            worksheet = spreadsheet.worksheet(sheet_name)
-            
-            # Get all records as list of dictionaries
-            records = worksheet.get_all_records()
+            values = self._get_sheet_values(sheet_name, modified_time=modified_time, force=force)
             
-            if not records:
+            if len(values) < 2:
                 logger.warning("[GOOGLE SHEETS LOADER] No data found in knowledge spreadsheet")
                 return None
             
-            # Convert to DataFrame
-            df = pd.DataFrame(records)
-            
-            # Validate required columns
+            # Validate required columns on the header row before building anything
             required_columns = ['Question', 'Answer', 'Category']
-            if not all(col in df.columns for col in required_columns):
+            header = values[0]
+            if not all(col in header for col in required_columns):
                 logger.error("[GOOGLE SHEETS LOADER] Missing required columns. Expected: %s, Got: %s", 
-                           required_columns, df.columns.tolist())
+                           required_columns, header)
                 return None
             
+            # Build the DataFrame straight from the 2D values (no per-row dicts)
+            df = _values_to_dataframe(values)
+            
             logger.info("[GOOGLE SHEETS LOADER] Successfully loaded %d knowledge records", len(df))
             return df
             
@@ -145,12 +464,19 @@ class GoogleSheetsLoader:
             logger.error("[GOOGLE SHEETS LOADER] Error loading knowledge data: %s", e, exc_info=True)
             return None
     
-    def load_jobs_data(self, sheet_name: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+    def load_jobs_data(
+        self,
+        sheet_name: Optional[str] = None,
+        modified_time: Optional[str] = None,
+        force: bool = False,
+    ) -> Optional[List[Dict[str, Any]]]:
         """
         Load job listings from Google Sheets.
         
         Args:
             sheet_name: Tên tab/sheet (default: dùng giá trị từ __init__)
+            modified_time: Spreadsheet modifiedTime read before loading (see load_all_sheets)
+            force: Fetch the rows even if recently cached
         
         Returns:
             List of job dictionaries with structure matching jobs.json format
@@ -166,33 +492,28 @@ class GoogleSheetsLoader:
             logger.info("[GOOGLE SHEETS LOADER] Loading jobs data from spreadsheet: %s, sheet: %s", 
                        self.spreadsheet_id, sheet_name)
             
-            client = self._get_client()
-            spreadsheet = client.open_by_key(self.spreadsheet_id)
-            worksheet = spreadsheet.worksheet(sheet_name)
+            values = self._get_sheet_values(sheet_name, modified_time=modified_time, force=force)
             
-            # Get all records
-            records = worksheet.get_all_records()
-            
-            if not records:
+            if len(values) < 2:
                 logger.warning("[GOOGLE SHEETS LOADER] No data found in jobs spreadsheet")
                 return None
             
-            # Convert to job format
-            jobs = []
-            for record in records:
-                job = {
-                    "id": record.get("id", ""),
-                    "title": record.get("title", ""),
-                    "location": record.get("location", ""),
-                    "type": record.get("type", ""),
-                    "salary": record.get("salary", ""),
-                    "description": record.get("description", ""),
-                    "skills": self._parse_list_field(record.get("skills", "")),
-                    "requirements": self._parse_list_field(record.get("requirements", "")),
-                    "benefits": self._parse_list_field(record.get("benefits", "")),
-                    "contact": record.get("contact", "")
-                }
-                jobs.append(job)
+            import pandas as pd
+            from gspread.utils import numericise_all
+            
+            # Same records get_all_records() returns (numeric strings as numbers)
+            header = values[0]
+            records = [
+                dict(zip(header, numericise_all(row + [""] * (len(header) - len(row)))))
+                for row in values[1:]
+            ]
+            
+            # Convert to job format column-wise: missing columns become "",
+            # list columns are parsed for all jobs at once
+            df = pd.DataFrame(records).reindex(columns=JOB_FIELDS, fill_value="")
+            for field in JOB_LIST_FIELDS:
+                df[field] = _parse_list_column(df[field])
+            jobs = df.to_dict(orient="records")
             
             logger.info("[GOOGLE SHEETS LOADER] Successfully loaded %d job listings", len(jobs))
             return jobs
@@ -201,49 +522,27 @@ class GoogleSheetsLoader:
             logger.error("[GOOGLE SHEETS LOADER] Error loading jobs data: %s", e, exc_info=True)
             return None
     
-    def _parse_list_field(self, field_value: str) -> List[str]:
-        """
-        Parse comma-separated or newline-separated string into list.
-        
-        Args:
-            field_value: String value to parse
-        
-        Returns:
-            List of strings
-        """
-        if not field_value:
-            return []
-        
-        # Try comma separation first
-        if "," in field_value:
-            items = [item.strip() for item in field_value.split(",")]
-        # Try newline separation
-        elif "\n" in field_value:
-            items = [item.strip() for item in field_value.split("\n")]
-        # Single item
-        else:
-            items = [field_value.strip()]
-        
-        # Filter out empty strings
-        return [item for item in items if item]
-    
-    def save_knowledge_to_csv(self, output_file: str = "data/recruitment_knowledge.csv") -> bool:
+    def save_knowledge_to_csv(
+        self, output_file: str = "data/recruitment_knowledge.csv", df: Optional["pd.DataFrame"] = None
+    ) -> bool:
         """
         Load knowledge from Google Sheets and save to CSV file (for backup/cache).
         
         Args:
             output_file: Path to output CSV file
+            df: Knowledge already loaded with load_knowledge_data() (loaded if None)
         
         Returns:
             True if successful, False otherwise
         """
         try:
-            df = self.load_knowledge_data()
+            if df is None:
+                df = self.load_knowledge_data()
             if df is None:
                 return False
             
             # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            ensure_dir(os.path.dirname(output_file))
             
             # Save to CSV
             df.to_csv(output_file, index=False, encoding='utf-8')
@@ -254,29 +553,35 @@ class GoogleSheetsLoader:
             logger.error("[GOOGLE SHEETS LOADER] Error saving knowledge to CSV: %s", e, exc_info=True)
             return False
     
-    def save_jobs_to_json(self, output_file: str = "data/jobs.json") -> bool:
+    def save_jobs_to_json(
+        self, output_file: str = "data/jobs.json", jobs: Optional[List[Dict[str, Any]]] = None
+    ) -> bool:
         """
         Load jobs from Google Sheets and save to JSON file (for backup/cache).
         
         Args:
             output_file: Path to output JSON file
+            jobs: Jobs already loaded with load_jobs_data() (loaded if None)
         
         Returns:
             True if successful, False otherwise
         """
         try:
-            import json
-            
-            jobs = self.load_jobs_data()
+            if jobs is None:
+                jobs = self.load_jobs_data()
             if jobs is None:
                 return False
             
             # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            ensure_dir(os.path.dirname(output_file))
             
-            # Save to JSON
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump({"jobs": jobs}, f, ensure_ascii=False, indent=2)
+            # Save to JSON (orjson writes UTF-8 bytes directly when it's installed)
+            if orjson is not None:
+                with open(output_file, 'wb') as f:
+                    f.write(orjson.dumps({"jobs": jobs}, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    json.dump({"jobs": jobs}, f, ensure_ascii=False, indent=2)
             
             logger.info("[GOOGLE SHEETS LOADER] Saved jobs data to: %s", output_file)
             return True
@@ -1,18 +1,159 @@
 """Knowledge base setup for Recruitment Chatbot"""
 import os
+import asyncio
+import hashlib
+import json
 import logging
+import threading
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 from agno.knowledge import Knowledge
 # from agno.knowledge.embedder.google import GeminiEmbedder
-from agno.knowledge.embedder.openai import OpenAIEmbedder
 from agno.vectordb.lancedb import LanceDb
 from agno.knowledge.chunking.row import RowChunking
 from agno.knowledge.reader.csv_reader import CSVReader
-from google_sheets_loader import GoogleSheetsLoader
+from agno.utils.string import generate_id
+from embedding_cache import CachedOpenAIEmbedder
+from google_sheets_loader import GoogleSheetsLoader, ensure_dir, read_cached_modified, write_cached_modified
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# LanceDB searches are brute force until an ANN index is built. IVF needs enough
+# rows to train its partitions, so tiny tables stay on flat search. Below
+# HNSW_MAX_ROWS an IVF_HNSW_SQ index is used (vectors scalar-quantized to int8,
+# 4x smaller than FP32); larger tables get IVF_PQ with 8-bit codes per
+# sub-vector. 96 sub-vectors divide both 1536 and 3072 dimensions evenly.
+ANN_INDEX_MIN_ROWS = 256
+HNSW_MAX_ROWS = 100_000
+PQ_NUM_SUB_VECTORS = 96
+PQ_NUM_BITS = 8
+
+# Rows embedded per OpenAI request when (re)loading the knowledge base
+EMBED_BATCH_SIZE = 256
+
+# Knowledge bases set up in this process, keyed by (lancedb_path, table_name)
+_knowledge_cache: Dict[Tuple[str, str], Knowledge] = {}
+_knowledge_lock = threading.Lock()
+
+
+def _vector_index_is_current(table, vector_column: str) -> bool:
+    """True if vector_column has an index that covers every row of the table"""
+    for index in table.list_indices():
+        if vector_column in index.columns:
+            stats = table.index_stats(index.name)
+            return stats is not None and stats.num_unindexed_rows == 0
+    return False
+
+
+def ensure_vector_index(vector_db: LanceDb, replace: bool = False) -> None:
+    """
+    Build an approximate-nearest-neighbour index on the LanceDB vector column.
+    
+    The index is (re)built when missing or when rows were added after it was
+    built (e.g. the CSV was reloaded), since LanceDB scans unindexed rows flat.
+    
+    Args:
+        vector_db: LanceDb whose table should be indexed
+        replace: Rebuild the index even if it already covers every row
+    """
+    table = vector_db.table
+    if table is None:
+        return
+    try:
+        num_rows = table.count_rows()
+        if num_rows < ANN_INDEX_MIN_ROWS:
+            logger.debug("Skip vector index: only %d rows (flat search is fine)", num_rows)
+            return
+        if not replace and _vector_index_is_current(table, vector_db._vector_col):
+            return
+        
+        index_type = "IVF_HNSW_SQ" if num_rows < HNSW_MAX_ROWS else "IVF_PQ"
+        index_kwargs = {
+            "metric": "cosine",
+            "vector_column_name": vector_db._vector_col,
+            "num_partitions": max(1, min(1024, int(num_rows ** 0.5))),
+            "index_type": index_type,
+            "replace": True,
+        }
+        if index_type == "IVF_PQ":
+            index_kwargs["num_sub_vectors"] = PQ_NUM_SUB_VECTORS
+            index_kwargs["num_bits"] = PQ_NUM_BITS
+        table.create_index(**index_kwargs)
+        logger.info("✅ Built %s vector index on %d rows", index_type, num_rows)
+    except Exception as e:
+        logger.warning("⚠️ Could not build vector index, using flat search: %s", e)
+
+
+def _row_id(content: str) -> str:
+    """LanceDb document id of a row: md5 of its text (what LanceDb.insert stores)"""
+    return hashlib.md5(content.replace("\x00", "\ufffd").encode()).hexdigest()
+
+
+def _content_hash(csv_file: str) -> str:
+    """Content hash Knowledge.add_content(path=csv_file) stores in each row's payload"""
+    return hashlib.sha256(str(csv_file).encode()).hexdigest()
+
+
+def _read_csv_rows(csv_file: str):
+    """Row documents of csv_file, exactly as Knowledge.add_content chunks them"""
+    path = Path(csv_file)
+    return CSVReader(chunking_strategy=RowChunking()).read(path, name=path.name)
+
+
+def sync_knowledge_rows(vector_db: LanceDb, csv_file: str) -> bool:
+    """
+    Bring the LanceDB table in line with csv_file, embedding only changed rows.
+    
+    LanceDb keys every row by the md5 of its text, so the ids already in the
+    table are the row hashes of the previous ingest. This mirrors agno's id
+    scheme (pinned in pyproject.toml; tests/test_knowledge_sync.py checks it). Rows whose hash is missing
+    are embedded and inserted; rows of this CSV that no longer exist are
+    deleted in one statement. Knowledge.add_content instead deletes the whole
+    CSV row by row and re-inserts every row on each start.
+    
+    Args:
+        vector_db: LanceDb holding the knowledge table
+        csv_file: Path to the knowledge CSV
+    
+    Returns:
+        True if synced, False if the table is empty (caller does a full load)
+    """
+    table = vector_db.table
+    if table is None:
+        return False
+    num_rows = table.count_rows()
+    if num_rows == 0:
+        return False
+    
+    # Same hash/id Knowledge.add_content(path=csv_file) gives the CSV content
+    content_hash = _content_hash(csv_file)
+    content_id = generate_id(content_hash)
+    documents = {}
+    for document in _read_csv_rows(csv_file):
+        document.content_id = content_id
+        documents[_row_id(document.content)] = document
+    
+    existing = table.search().select([vector_db._id, "payload"]).limit(num_rows).to_arrow().to_pydict()
+    existing_ids = set(existing[vector_db._id])
+    stale_ids = [
+        row_id
+        for row_id, payload in zip(existing[vector_db._id], existing["payload"])
+        if row_id not in documents and json.loads(payload).get("content_hash") == content_hash
+    ]
+    new_documents = [document for row_id, document in documents.items() if row_id not in existing_ids]
+    
+    if stale_ids:
+        quoted_ids = ", ".join(f"'{row_id}'" for row_id in stale_ids)
+        table.delete(f"{vector_db._id} IN ({quoted_ids})")
+    if new_documents:
+        asyncio.run(vector_db.async_insert(content_hash=content_hash, documents=new_documents))
+    logger.info(
+        "✅ Synced knowledge from %s: %d new, %d removed, %d unchanged rows",
+        csv_file, len(new_documents), len(stale_ids), len(documents) - len(new_documents),
+    )
+    return True
+
 
 def setup_knowledge_base(
     lancedb_path: str = "tmp/lancedb",
@@ -20,66 +161,125 @@ def setup_knowledge_base(
     table_name: str = "recruitment_knowledge",
     use_google_sheets: bool = True,
     force_reload: bool = False,
+    vector_db: Optional[LanceDb] = None,
 ) -> Knowledge:
     """
     Setup knowledge base with LanceDB and data from Google Sheets or CSV.
     
+    The knowledge base is set up once per (lancedb_path, table_name) in a
+    process; later calls return the same Knowledge (LanceDB reads are safe
+    to share) unless force_reload is True, which rebuilds and replaces it.
+    
     Args:
         lancedb_path: Path to LanceDB storage
         csv_file: Path to CSV file with recruitment knowledge (fallback)
         table_name: Name of the LanceDB table
         use_google_sheets: Whether to load data from Google Sheets (default: True)
         force_reload: If True, always reload from Google Sheets even if CSV exists (default: False)
+        vector_db: Existing LanceDb to reuse (keeps its connection and embedder client on reload)
     
     Returns:
         Knowledge: Configured knowledge base
     """
+    key = (lancedb_path, table_name)
+    # Held during setup so concurrent callers wait for one load instead of ingesting twice
+    with _knowledge_lock:
+        knowledge = None if force_reload else _knowledge_cache.get(key)
+        if knowledge is None:
+            knowledge = _load_knowledge_base(
+                lancedb_path=lancedb_path,
+                csv_file=csv_file,
+                table_name=table_name,
+                use_google_sheets=use_google_sheets,
+                force_reload=force_reload,
+                vector_db=vector_db,
+            )
+            _knowledge_cache[key] = knowledge
+        return knowledge
+
+
+def clear_knowledge_cache() -> None:
+    """Forget the knowledge bases set up so far (the next setup loads again)"""
+    with _knowledge_lock:
+        _knowledge_cache.clear()
+
+
+def _load_knowledge_base(
+    lancedb_path: str,
+    csv_file: str,
+    table_name: str,
+    use_google_sheets: bool,
+    force_reload: bool,
+    vector_db: Optional[LanceDb],
+) -> Knowledge:
+    """Build the knowledge base (see setup_knowledge_base)"""
     # Create directories if they don't exist
-    Path(lancedb_path).parent.mkdir(parents=True, exist_ok=True)
-    os.makedirs("data", exist_ok=True)
+    ensure_dir(str(Path(lancedb_path).parent))
+    ensure_dir("data")
     
-    # Initialize knowledge base with LanceDB
-    knowledge = Knowledge(
-        vector_db=LanceDb(
+    # Initialize knowledge base with LanceDB, reusing the existing store if given
+    if vector_db is None:
+        vector_db = LanceDb(
             uri=lancedb_path,
             table_name=table_name,
-            embedder=OpenAIEmbedder(),
-        ),
+            # Reuses embeddings across reloads and restarts; new rows are
+            # embedded EMBED_BATCH_SIZE at a time instead of one request per row
+            embedder=CachedOpenAIEmbedder(enable_batch=True, batch_size=EMBED_BATCH_SIZE),
+        )
+    knowledge = Knowledge(
+        vector_db=vector_db,
         max_results=1
     )
     
-    # Try to load from Google Sheets only if CSV cache doesn't exist or force_reload is True
-    # This avoids unnecessary API calls on every initialization
-    if use_google_sheets and (force_reload or not os.path.exists(csv_file)):
+    # Pull the sheet only if the CSV cache doesn't exist, force_reload is True, or
+    # the spreadsheet changed since the cache was written. The change check is a
+    # single Drive metadata call instead of downloading every row
+    remote_modified = None
+    refresh = force_reload or not os.path.exists(csv_file)
+    if use_google_sheets and not refresh:
         try:
-            logger.info("CSV cache not found. Attempting to load knowledge from Google Sheets...")
+            remote_modified = GoogleSheetsLoader().get_last_modified()
+            refresh = remote_modified is not None and remote_modified > read_cached_modified(csv_file)
+        except Exception as e:
+            logger.warning("⚠️ Could not check Google Sheets for changes: %s", e)
+    
+    if use_google_sheets and refresh:
+        try:
+            logger.info("CSV cache missing or outdated. Attempting to load knowledge from Google Sheets...")
             sheets_loader = GoogleSheetsLoader()
+            # Read the version before the rows, so edits made meanwhile trigger the next refresh
+            if remote_modified is None:
+                remote_modified = sheets_loader.get_last_modified()
             
             # Load data from Google Sheets
-            df = sheets_loader.load_knowledge_data()
+            df = sheets_loader.load_knowledge_data(modified_time=remote_modified, force=force_reload)
             
             if df is not None:
                 # Save to CSV as cache
-                sheets_loader.save_knowledge_to_csv(csv_file)
+                if sheets_loader.save_knowledge_to_csv(csv_file, df=df) and remote_modified:
+                    write_cached_modified(csv_file, remote_modified)
                 logger.info("✅ Loaded knowledge from Google Sheets and cached to %s", csv_file)
             else:
                 logger.warning("⚠️ Could not load from Google Sheets, will try local CSV if exists")
         except Exception as e:
             logger.warning("⚠️ Error loading from Google Sheets: %s. Will try local CSV if exists", e)
     elif use_google_sheets and os.path.exists(csv_file):
-        logger.info("Using cached CSV file: %s (skip Google Sheets to improve performance)", csv_file)
+        logger.info("Using cached CSV file: %s (Google Sheets unchanged)", csv_file)
     
     # Load CSV data (either from cache or original file)
     if os.path.exists(csv_file):
         try:
-            # Add CSV content with row-based chunking
-            knowledge.add_content(
-                path=csv_file,
-                reader=CSVReader(
-                    chunking_strategy=RowChunking(),
-                ),
-            )
-            logger.info("✅ Loaded knowledge from %s", csv_file)
+            # Only embed rows that changed since the last load; full load on an empty table
+            if not sync_knowledge_rows(vector_db, csv_file):
+                # Add CSV content with row-based chunking
+                knowledge.add_content(
+                    path=csv_file,
+                    reader=CSVReader(
+                        chunking_strategy=RowChunking(),
+                    ),
+                )
+                logger.info("✅ Loaded knowledge from %s", csv_file)
+            ensure_vector_index(vector_db)
         except Exception as e:
             logger.error("❌ Error loading CSV file: %s", e)
     else:
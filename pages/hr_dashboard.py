@@ -1,12 +1,11 @@
 """HR Dashboard - View all conversations"""
+import hashlib
+import hmac
 import os
 import streamlit as st
+from pathlib import Path
 from datetime import datetime as dt
-from dotenv import load_dotenv
-from agent import get_all_sessions_from_db
-
-# Load environment variables
-load_dotenv()
+from functools import lru_cache
 
 # Page configuration
 st.set_page_config(
@@ -16,40 +15,53 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: bold;
-        color: #1f77b4;
-        text-align: center;
-        margin-bottom: 1rem;
-    }
-    .session-card {
-        border: 1px solid #ddd;
-        border-radius: 8px;
-        padding: 1rem;
-        margin-bottom: 1rem;
-        background-color: #f9f9f9;
-    }
-    .message-user {
-        background-color: #e3f2fd;
-        padding: 0.5rem;
-        border-radius: 5px;
-        margin: 0.5rem 0;
-    }
-    .message-assistant {
-        background-color: #f5f5f5;
-        padding: 0.5rem;
-        border-radius: 5px;
-        margin: 0.5rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Custom CSS: the header style is shared with the login page, the rest is
+# only rendered once HR is authenticated
+STATIC_DIR = Path(__file__).parent.parent / "static"
+
+@st.cache_resource
+def load_css(path):
+    """Read a stylesheet and return it as a minified <style> tag (built once per process)"""
+    css = path.read_text(encoding="utf-8")
+    return f"<style>{' '.join(css.split())}</style>"
+
+st.markdown(load_css(STATIC_DIR / "hr_header.css"), unsafe_allow_html=True)
 
-# HR Password
-HR_PASSWORD = "123123"
+# Sessions per page in the list view
+PAGE_SIZE = 20
+
+# Following sessions whose messages are fetched together with the opened one
+PREFETCH_COUNT = 3
+
+# HR password, stored in HR_PASSWORD_HASH as "scrypt$n$r$p$<salt hex>$<hash hex>".
+# There is no default: login is refused while it is unset. Generate one with:
+#   python -c "import hashlib,os; s=os.urandom(16); print('$'.join(['scrypt', '16384', '8', '1', s.hex(), hashlib.scrypt(b'PASSWORD', salt=s, n=16384, r=8, p=1).hex()]))"
+PASSWORD_HASH_SCHEME = "scrypt"
+
+@lru_cache(maxsize=1)
+def _hr_password_hash():
+    """Parsed HR_PASSWORD_HASH (n, r, p, salt, digest), read from the environment once; None if unset or invalid"""
+    from dotenv import load_dotenv
+    load_dotenv()
+    stored = os.getenv("HR_PASSWORD_HASH", "")
+    try:
+        scheme, n, r, p, salt, digest = stored.split("$")
+        if scheme != PASSWORD_HASH_SCHEME:
+            return None
+        return int(n), int(r), int(p), bytes.fromhex(salt), bytes.fromhex(digest)
+    except ValueError:
+        return None
+
+def _verify_password(password):
+    """Check a password against HR_PASSWORD_HASH (always False when it is not configured)"""
+    stored = _hr_password_hash()
+    if stored is None:
+        return False
+    n, r, p, salt, digest = stored
+    candidate = hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, n=n, r=r, p=p, maxmem=256 * 1024 * 1024, dklen=len(digest)
+    )
+    return hmac.compare_digest(candidate, digest)
 
 def check_hr_auth():
     """Check if user is authenticated as HR"""
@@ -69,7 +81,9 @@ def login_page():
         submitted = st.form_submit_button("🔑 Đăng nhập", use_container_width=True)
         
         if submitted:
-            if password == HR_PASSWORD:
+            if _hr_password_hash() is None:
+                st.error("❌ Chưa cấu hình HR_PASSWORD_HASH (scrypt), không thể đăng nhập.")
+            elif _verify_password(password):
                 st.session_state.hr_authenticated = True
                 st.session_state.hr_username = username
                 st.rerun()
@@ -77,8 +91,9 @@ def login_page():
                 st.error("❌ Mật khẩu không đúng! Vui lòng thử lại.")
     
 
+@lru_cache(maxsize=4096)
 def format_datetime(datetime_value):
-    """Format datetime to readable string"""
+    """Format datetime to readable string (memoized; values are str, unix timestamps or datetimes)"""
     if datetime_value:
         if isinstance(datetime_value, str):
             return datetime_value
@@ -86,70 +101,231 @@ def format_datetime(datetime_value):
             # Handle unix timestamp
             try:
                 return dt.fromtimestamp(datetime_value).strftime("%d/%m/%Y %H:%M:%S")
-            except:
+            except (OverflowError, OSError, ValueError):
                 return str(datetime_value)
         elif hasattr(datetime_value, 'strftime'):
             return datetime_value.strftime("%d/%m/%Y %H:%M:%S")
     return "N/A"
 
-def display_conversation_detail(session):
+def _truncate(text, limit):
+    """Shorten text to limit characters, adding an ellipsis when cut"""
+    return text[:limit] + "..." if len(text) > limit else text
+
+def _session_view(session):
+    """
+    Display fields of a listed session, shared by the sidebar, the main list and the detail header.
+    
+    Args:
+        session: SessionRow from get_session_index
+    
+    Returns:
+        Dict of preformatted labels
+    """
+    return {
+        "session_id": session.session_id,
+        "label_short": _truncate(session.preview, 25) or 'Session',
+        "label_long": _truncate(session.preview, 50) or 'Cuộc trò chuyện',
+        "session_label": f"{session.session_id[:8]}...",
+        "user_label": f"{session.user_id[:8]}..." if session.user_id else 'N/A',
+        "created_at": format_datetime(session.created_at),
+        "msg_count": session.msg_count,
+    }
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_sessions(db_file, search=None, order="desc", limit=-1, offset=0):
+    """
+    Load one page of the session list as view dicts, cached briefly so reruns
+    don't re-query the database or re-format labels.
+    
+    Returns:
+        Tuple of (list of _session_view dicts, total matching sessions)
+    """
+    from agent import get_session_index
+    sessions, total = get_session_index(db_file, search=search, order=order, limit=limit, offset=offset)
+    return [_session_view(session) for session in sessions], total
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _count_sessions(db_file, search=None):
+    """Count sessions matching search, cached like _load_sessions"""
+    from agent import count_sessions
+    return count_sessions(db_file, search=search)
+
+def _load_messages(session_id, neighbor_ids=()):
+    """
+    Get a session's messages, prefetching neighboring sessions in the same query.
+    
+    Args:
+        session_id: Session being opened
+        neighbor_ids: Session IDs likely to be opened next (e.g. the following cards)
+    
+    Returns:
+        List of SessionMessage
+    """
+    cache = st.session_state.setdefault("message_cache", {})
+    if session_id not in cache:
+        from agent import fetch_messages_bulk
+        missing = [sid for sid in (session_id, *neighbor_ids) if sid not in cache]
+        cache.update(fetch_messages_bulk(st.session_state.db_file, missing))
+    return cache[session_id]
+
+def _remember_sessions(sessions):
+    """Index listed session views by id so the detail view can resolve the selected one"""
+    st.session_state.sessions_by_id.update((view["session_id"], view) for view in sessions)
+
+def _open_session(session_id, neighbor_ids=()):
+    """Select a session for the detail view and remember which sessions to prefetch with it"""
+    st.session_state.viewing_session_id = session_id
+    st.session_state.prefetch_ids = list(neighbor_ids)
+    st.session_state.opened_count = st.session_state.get("opened_count", 0) + 1
+
+def display_conversation_detail(session_id, messages):
     """Display detailed conversation view"""
-    session_id = getattr(session, 'session_id', 'N/A')
     st.subheader("📋 Chi tiết cuộc trò chuyện")
     st.code(f"Session ID: {session_id}")
     
-    runs = getattr(session, 'runs', [])
-    if not runs:
-        st.info("Không có tin nhắn nào trong cuộc trò chuyện này.")
-        return
-    
-    # Collect all messages from all runs
-    all_messages = []
-    for run in runs:
-        messages = getattr(run, 'messages', [])
-        if messages:
-            for msg in messages:
-                role = getattr(msg, 'role', None) or getattr(msg, 'name', 'unknown')
-                if role not in ['user', 'assistant']:
-                    continue
-                all_messages.append(msg)
-    
-    if not all_messages:
+    if not messages:
         st.info("Không có tin nhắn nào trong cuộc trò chuyện này.")
         return
     
     # Display messages
-    for msg in all_messages:
-        role = getattr(msg, 'role', None) or getattr(msg, 'name', 'unknown')
-        content = getattr(msg, 'content', '') or getattr(msg, 'text', '')
-        
-        # Skip system messages
-        if role == 'system':
-            continue
-        
-        if role == 'user' or role == 'human':
+    for msg in messages:
+        if msg.role == 'user':
             with st.chat_message("user", avatar="👤"):
-                st.markdown(content)
-        elif role == 'assistant':
+                st.markdown(msg.content)
+        elif msg.role == 'assistant':
             with st.chat_message("assistant", avatar="🤖"):
-                st.markdown(content)
+                st.markdown(msg.content)
+
+@st.fragment
+def _sidebar_sessions():
+    """
+    Sidebar list of recent conversations.
+    
+    Runs as a fragment so interacting with it only reruns the sidebar list;
+    opening a conversation triggers a full rerun to switch the main panel.
+    """
+    st.subheader("📚 Lịch sử cuộc trò chuyện")
+    try:
+        # Newest first, sorted in SQL
+        sessions, _ = _load_sessions(st.session_state.db_file, limit=20)
+        _remember_sessions(sessions)
+        
+        if sessions:
+            # One selectbox for the 20 most recent sessions instead of a button per session
+            previews = {view["session_id"]: view["label_short"] for view in sessions}
+            session_ids = list(previews)
+            current = st.session_state.viewing_session_id
+            selected_id = st.selectbox(
+                "Chọn cuộc trò chuyện",
+                session_ids,
+                index=session_ids.index(current) if current in previews else None,
+                format_func=previews.get,
+                placeholder="Chọn cuộc trò chuyện...",
+                label_visibility="collapsed",
+            )
+            if selected_id is not None and selected_id != current:
+                index = session_ids.index(selected_id)
+                next_ids = session_ids[index + 1:index + 1 + PREFETCH_COUNT]
+                _open_session(selected_id, next_ids)
+                st.rerun()
         else:
-            # For other message types
-            st.markdown(f"**{role}:** {content}")
+            st.info("📭 Chưa có cuộc trò chuyện nào")
+    except Exception as e:
+        st.error(f"Lỗi: {str(e)}")
+
+@st.fragment
+def _session_list_view():
+    """
+    Main-panel list of conversations with search, sort and paging.
+    
+    Runs as a fragment: typing a search, changing the sort or the page only
+    reruns this list, not the sidebar; selecting a row triggers a full rerun.
+    """
+    try:
+        # Filter/search
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            search_term = st.text_input("🔍 Tìm kiếm", placeholder="Tìm theo session ID hoặc user ID...")
+        with col2:
+            sort_option = st.selectbox("📊 Sắp xếp", ["Mới nhất", "Cũ nhất"])
+        
+        # Filter, sort and paginate in SQLite; the page query also returns the match count
+        search = search_term.strip() or None
+        order = "desc" if sort_option == "Mới nhất" else "asc"
+        page = st.session_state.get("session_page", 1)
+        filtered_sessions, total_filtered = _load_sessions(
+            st.session_state.db_file,
+            search=search,
+            order=order,
+            limit=PAGE_SIZE,
+            offset=(page - 1) * PAGE_SIZE,
+        )
+        if not filtered_sessions and page > 1:
+            # The filter shrank past the current page; go back to the first one
+            page = st.session_state.session_page = 1
+            filtered_sessions, total_filtered = _load_sessions(
+                st.session_state.db_file, search=search, order=order, limit=PAGE_SIZE
+            )
+        
+        _remember_sessions(filtered_sessions)
+        total_sessions = _count_sessions(st.session_state.db_file) if search else total_filtered
+        if not total_sessions:
+            st.info("📭 Chưa có cuộc trò chuyện nào được lưu.")
+            return
+        
+        max_pages = max(1, -(-total_filtered // PAGE_SIZE))
+        page = st.number_input("📄 Trang", min_value=1, max_value=max_pages, step=1, key="session_page")
+        
+        st.info(f"📊 Hiển thị {len(filtered_sessions)}/{total_filtered} cuộc trò chuyện (trang {page}/{max_pages}, tổng {total_sessions})")
+        
+        # Display sessions as one selectable table instead of a card + button per session
+        table = [
+            {
+                "Xem trước": view["label_long"],
+                "Session": view["session_label"],
+                "User": view["user_label"],
+                "Thời gian": view["created_at"],
+                "Tin nhắn": view["msg_count"],
+            }
+            for view in filtered_sessions
+        ]
+        # A fresh key per opened session so the table comes back unselected
+        event = st.dataframe(
+            table,
+            hide_index=True,
+            use_container_width=True,
+            on_select="rerun",
+            selection_mode="single-row",
+            key=f"session_table_{st.session_state.get('opened_count', 0)}",
+        )
+        if event.selection.rows:
+            index = event.selection.rows[0]
+            next_ids = [view["session_id"] for view in filtered_sessions[index + 1:index + 1 + PREFETCH_COUNT]]
+            _open_session(filtered_sessions[index]["session_id"], next_ids)
+            st.rerun()
+    
+    except Exception as e:
+        st.error(f"❌ Lỗi khi tải danh sách cuộc trò chuyện: {str(e)}")
+        st.exception(e)
 
 def dashboard_page():
     """Display HR dashboard with all conversations"""
+    st.markdown(load_css(STATIC_DIR / "hr_dashboard.css"), unsafe_allow_html=True)
     st.markdown('<div class="main-header">👥 HR Dashboard</div>', unsafe_allow_html=True)
     
     # Get database file path (no need to initialize full agent)
     if "db_file" not in st.session_state:
+        # Load environment variables (only needed once HR is logged in)
+        from dotenv import load_dotenv
+        load_dotenv()
         st.session_state.db_file = os.getenv("DB_FILE", "tmp/recruitment_db.db")
     
     # Initialize viewing session state
     if "viewing_session_id" not in st.session_state:
         st.session_state.viewing_session_id = None
-    if "selected_session" not in st.session_state:
-        st.session_state.selected_session = None
+    # Listed sessions by id; the selection is stored as an id and resolved here
+    if "sessions_by_id" not in st.session_state:
+        st.session_state.sessions_by_id = {}
     
     # Sidebar
     with st.sidebar:
@@ -159,178 +335,44 @@ def dashboard_page():
             st.session_state.hr_authenticated = False
             st.session_state.hr_username = None
             st.session_state.viewing_session_id = None
-            st.session_state.selected_session = None
+            st.rerun()
+        
+        if st.button("🔄 Làm mới", use_container_width=True):
+            _load_sessions.clear()
+            _count_sessions.clear()
+            st.session_state.message_cache = {}
+            st.session_state.sessions_by_id = {}
             st.rerun()
         
         st.divider()
         
         # Conversations list in sidebar
-        st.subheader("📚 Lịch sử cuộc trò chuyện")
-        try:
-            sessions = get_all_sessions_from_db(db_file=st.session_state.db_file)
-            
-            if sessions:
-                # Sort by created_at descending (newest first)
-                try:
-                    sessions = sorted(
-                        sessions,
-                        key=lambda x: getattr(x, 'created_at', 0) or 0,
-                        reverse=True
-                    )
-                except:
-                    pass
-                
-                # Show sessions list (limit to 20 most recent)
-                for session in sessions[:20]:
-                    session_id = getattr(session, 'session_id', 'N/A')
-                    created_at = format_datetime(getattr(session, 'created_at', None))
-                    runs = getattr(session, 'runs', [])
-                    
-                    # Get preview text
-                    preview_text = ""
-                    for run in runs:
-                        messages = getattr(run, 'messages', [])
-                        for msg in messages:
-                            role = getattr(msg, 'role', '')
-                            if role == 'user':
-                                content = getattr(msg, 'content', '') or getattr(msg, 'text', '')
-                                if content:
-                                    preview_text = content[:25] + "..." if len(content) > 25 else content
-                                    break
-                        if preview_text:
-                            break
-                    
-                    # Check if this session is selected
-                    is_selected = st.session_state.viewing_session_id == session_id
-                    button_label = f"{'✓ ' if is_selected else ''}{preview_text or 'Session'}"
-                    
-                    if st.button(button_label, key=f"sidebar_session_{session_id}", use_container_width=True):
-                        st.session_state.viewing_session_id = session_id
-                        st.session_state.selected_session = session
-                        st.rerun()
-            else:
-                st.info("📭 Chưa có cuộc trò chuyện nào")
-        except Exception as e:
-            st.error(f"Lỗi: {str(e)}")
+        _sidebar_sessions()
         
         # Button to go back to list view
         if st.session_state.viewing_session_id:
             st.divider()
             if st.button("🔙 Quay lại danh sách", use_container_width=True):
                 st.session_state.viewing_session_id = None
-                st.session_state.selected_session = None
                 st.rerun()
     
     # Main content area
-    if st.session_state.viewing_session_id and st.session_state.selected_session:
+    if st.session_state.viewing_session_id:
         # Display selected conversation in main chat area
-        selected_session = st.session_state.selected_session
-        session_id = getattr(selected_session, 'session_id', 'N/A')
-        user_id = getattr(selected_session, 'user_id', 'N/A')
-        created_at = format_datetime(getattr(selected_session, 'created_at', None))
-        
-        st.info(f"📋 **Đang xem cuộc trò chuyện:** Session {session_id[:8]}... | User {user_id[:8] if user_id != 'N/A' else 'N/A'}... | {created_at}")
+        # Messages are loaded only now (with the next few sessions prefetched)
+        session_id = st.session_state.viewing_session_id
+        view = st.session_state.sessions_by_id.get(session_id)
+        messages = _load_messages(session_id, st.session_state.get("prefetch_ids", ()))
+        if view is not None:
+            st.info(f"📋 **Đang xem cuộc trò chuyện:** Session {view['session_label']} | User {view['user_label']} | {view['created_at']}")
+        else:
+            st.info(f"📋 **Đang xem cuộc trò chuyện:** Session {session_id[:8]}...")
         st.divider()
         
-        display_conversation_detail(selected_session)
+        display_conversation_detail(session_id, messages)
     else:
         # List view
-        try:
-            # Get all sessions
-            sessions = get_all_sessions_from_db(db_file=st.session_state.db_file)
-            
-            if not sessions:
-                st.info("📭 Chưa có cuộc trò chuyện nào được lưu.")
-                return
-            
-            # Filter/search
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                search_term = st.text_input("🔍 Tìm kiếm", placeholder="Tìm theo session ID hoặc user ID...")
-            with col2:
-                sort_option = st.selectbox("📊 Sắp xếp", ["Mới nhất", "Cũ nhất"])
-            
-            # Filter sessions
-            filtered_sessions = sessions
-            if search_term:
-                search_term = search_term.lower()
-                filtered_sessions = [
-                    s for s in sessions
-                    if search_term in str(getattr(s, 'session_id', '')).lower()
-                    or search_term in str(getattr(s, 'user_id', '')).lower()
-                ]
-            
-            # Sort sessions
-            if sort_option == "Mới nhất":
-                try:
-                    filtered_sessions = sorted(
-                        filtered_sessions,
-                        key=lambda x: getattr(x, 'created_at', 0) or 0,
-                        reverse=True
-                    )
-                except:
-                    pass
-            else:
-                try:
-                    filtered_sessions = sorted(
-                        filtered_sessions,
-                        key=lambda x: getattr(x, 'created_at', float('inf')) or float('inf'),
-                        reverse=False
-                    )
-                except:
-                    pass
-            
-            st.info(f"📊 Hiển thị {len(filtered_sessions)}/{len(sessions)} cuộc trò chuyện")
-            
-            # Display sessions as cards
-            for session in filtered_sessions:
-                session_id = getattr(session, 'session_id', 'N/A')
-                user_id = getattr(session, 'user_id', 'N/A')
-                created_at = format_datetime(getattr(session, 'created_at', None))
-                runs = getattr(session, 'runs', [])
-                num_runs = len(runs) if runs else 0
-                
-                # Count total messages across all runs
-                total_messages = 0
-                for run in runs:
-                    messages = getattr(run, 'messages', [])
-                    if messages:
-                        # Count non-system messages
-                        total_messages += len([m for m in messages if getattr(m, 'role', '') != 'system'])
-                
-                # Get first user message for preview
-                preview_text = ""
-                for run in runs:
-                    messages = getattr(run, 'messages', [])
-                    for msg in messages:
-                        role = getattr(msg, 'role', '')
-                        if role not in ['user', 'assistant']:
-                            continue
-
-                        if role == 'user':
-                            content = getattr(msg, 'content', '') or getattr(msg, 'text', '')
-                            if content:
-                                preview_text = content[:50] + "..." if len(content) > 50 else content
-                                break
-                    if preview_text:
-                        break
-                
-                # Card display
-                with st.container():
-                    col1, col2 = st.columns([3, 1])
-                    with col1:
-                        st.write(f"**{preview_text or 'Cuộc trò chuyện'}**")
-                        st.caption(f"Session: {session_id[:8]}... | User: {user_id[:8] if user_id != 'N/A' else 'N/A'}... | {created_at} | {total_messages} tin nhắn")
-                    with col2:
-                        if st.button("👁️ Xem", key=f"view_list_{session_id}", use_container_width=True):
-                            st.session_state.viewing_session_id = session_id
-                            st.session_state.selected_session = session
-                            st.rerun()
-                    st.divider()
-        
-        except Exception as e:
-            st.error(f"❌ Lỗi khi tải danh sách cuộc trò chuyện: {str(e)}")
-            st.exception(e)
+        _session_list_view()
 
 def main():
     """Main application"""
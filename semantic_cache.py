@@ -0,0 +1,389 @@
+"""Semantic response cache for Recruitment Chatbot"""
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    """One cached answer"""
+    scope: str
+    prompt: str
+    response: str
+    expires_at: float
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Lowercase and collapse whitespace so trivially different prompts share a key"""
+    return " ".join(prompt.lower().split())
+
+
+def _unit_vector(embedding: List[float]) -> Optional[np.ndarray]:
+    """Embedding as a unit-length float32 vector, or None if it is empty/invalid"""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector) if vector.size else 0
+    if vector.ndim != 1 or not norm:
+        return None
+    return vector / norm
+
+
+class SemanticCache:
+    """
+    In-process cache of agent answers keyed by prompt meaning.
+
+    Exact (normalized) prompts are served from a hash lookup without embedding.
+    Other prompts are embedded and compared by cosine similarity against the
+    cached prompts of the same scope with a single matrix product.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[str], List[float]],
+        embed_many: Optional[Callable[[List[str]], List[List[float]]]] = None,
+        threshold: float = 0.92,
+        ttl: float = 3600,
+        max_entries: int = 1024,
+    ):
+        """
+        Args:
+            embed: Function returning the embedding of a text
+            embed_many: Optional function embedding many texts in one call (used by store_many)
+            threshold: Minimum cosine similarity for a semantic hit
+            ttl: Seconds a cached answer stays valid
+            max_entries: Maximum number of cached answers (oldest evicted first)
+        """
+        self.embed = embed
+        self.embed_many = embed_many
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: dict = {}  # key -> CacheEntry, in insertion order
+        self._keys: List[str] = []  # row i of _matrix belongs to _keys[i]
+        self._matrix: Optional[np.ndarray] = None
+
+    @staticmethod
+    def make_key(prompt: str, scope: str = "") -> str:
+        """Cache key of the form cache:{scope}:{prompt sha256}"""
+        digest = hashlib.sha256(normalize_prompt(prompt).encode("utf-8")).hexdigest()
+        return f"cache:{scope}:{digest}"
+
+    def _embed_normalized(self, prompt: str) -> Optional[np.ndarray]:
+        """Unit-length embedding of prompt, or None if embedding failed"""
+        try:
+            return _unit_vector(self.embed(normalize_prompt(prompt)))
+        except Exception as e:
+            logger.warning("⚠️ Could not embed prompt for semantic cache: %s", e)
+            return None
+
+    def _drop(self, keys: set) -> None:
+        """Remove keys from the entries and the embedding matrix (lock held)"""
+        if not keys:
+            return
+        for key in keys:
+            self._entries.pop(key, None)
+        keep = [i for i, key in enumerate(self._keys) if key not in keys]
+        self._keys = [self._keys[i] for i in keep]
+        self._matrix = self._matrix[keep] if keep and self._matrix is not None else None
+
+    def lookup(self, prompt: str, scope: str = "") -> Optional[str]:
+        """
+        Find a cached answer for prompt.
+
+        Args:
+            prompt: User message
+            scope: Partition of the cache (e.g. user and model)
+
+        Returns:
+            Cached response, or None on a miss
+        """
+        now = time.time()
+        key = self.make_key(prompt, scope)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > now:
+                return entry.response
+            if not self._keys:
+                return None
+
+        query = self._embed_normalized(prompt)
+        if query is None:
+            return None
+
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != query.shape[0]:
+                return None
+            scores = self._matrix @ query
+            for i in np.argsort(scores)[::-1]:
+                if scores[i] < self.threshold:
+                    break
+                entry = self._entries[self._keys[i]]
+                if entry.scope == scope and entry.expires_at > now:
+                    logger.debug("Semantic cache hit (%.3f): %r ~ %r", scores[i], prompt, entry.prompt)
+                    return entry.response
+        return None
+
+    def store(self, prompt: str, response: str, scope: str = "") -> None:
+        """
+        Cache response as the answer to prompt.
+
+        Args:
+            prompt: User message
+            response: Agent response text
+            scope: Partition of the cache (e.g. user and model)
+        """
+        vector = self._embed_normalized(prompt)
+        if vector is None:
+            return
+
+        with self._lock:
+            self._insert(prompt, response, scope, vector, time.time())
+
+    def store_many(self, items: List[Tuple[str, str]], scope: str = "") -> int:
+        """
+        Cache many (prompt, response) pairs, embedding the prompts in one batch.
+
+        Args:
+            items: (prompt, response) pairs
+            scope: Partition of the cache (e.g. user and model)
+
+        Returns:
+            Number of pairs cached
+        """
+        if not items:
+            return 0
+        prompts = [normalize_prompt(prompt) for prompt, _ in items]
+        try:
+            if self.embed_many is not None:
+                embeddings = self.embed_many(prompts)
+            else:
+                embeddings = [self.embed(prompt) for prompt in prompts]
+        except Exception as e:
+            logger.warning("⚠️ Could not embed prompts for semantic cache: %s", e)
+            return 0
+
+        stored = 0
+        now = time.time()
+        with self._lock:
+            for (prompt, response), embedding in zip(items, embeddings):
+                vector = _unit_vector(embedding)
+                if vector is not None:
+                    self._insert(prompt, response, scope, vector, now)
+                    stored += 1
+        return stored
+
+    def _insert(self, prompt: str, response: str, scope: str, vector: np.ndarray, now: float) -> None:
+        """Add one entry, evicting expired and oldest entries (lock held)"""
+        key = self.make_key(prompt, scope)
+        if self._matrix is not None and self._matrix.shape[1] != vector.shape[0]:
+            # Embedder changed dimension; old vectors are not comparable
+            self._entries.clear()
+            self._keys = []
+            self._matrix = None
+        expired = {k for k, e in self._entries.items() if e.expires_at <= now}
+        expired.add(key)
+        self._drop(expired)
+        overflow = len(self._entries) - self.max_entries + 1
+        if overflow > 0:
+            self._drop(set(list(self._entries)[:overflow]))
+
+        self._entries[key] = CacheEntry(scope, prompt, response, now + self.ttl)
+        self._keys.append(key)
+        row = vector[np.newaxis, :]
+        self._matrix = row if self._matrix is None else np.vstack((self._matrix, row))
+
+    def clear(self) -> None:
+        """Drop all cached answers"""
+        with self._lock:
+            self._entries.clear()
+            self._keys = []
+            self._matrix = None
+
+
+def _escape_tag(value: str) -> str:
+    """Escape a value for use inside a RediSearch TAG filter"""
+    return re.sub(r"([^\w])", r"\\\1", value)
+
+
+class RedisSemanticCache:
+    """
+    SemanticCache backed by Redis so every app worker shares the same answers.
+
+    Entries are hashes under cache:recruitment:{scope}:{prompt sha256} with a
+    TTL; similar prompts are found with a RediSearch HNSW (cosine) KNN query
+    filtered by scope. Requires Redis Stack (RediSearch) and the redis package.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        embed: Callable[[str], List[float]],
+        embed_many: Optional[Callable[[List[str]], List[List[float]]]] = None,
+        threshold: float = 0.92,
+        ttl: float = 3600,
+        index_name: str = "recruitment_cache",
+        prefix: str = "cache:recruitment:",
+    ):
+        """
+        Args:
+            redis_url: Redis connection URL
+            embed: Function returning the embedding of a text
+            embed_many: Optional function embedding many texts in one call (used by store_many)
+            threshold: Minimum cosine similarity for a semantic hit
+            ttl: Seconds a cached answer stays valid
+            index_name: RediSearch index name
+            prefix: Key prefix of cached entries
+        """
+        import redis
+
+        self.embed = embed
+        self.embed_many = embed_many
+        self.threshold = threshold
+        self.ttl = int(ttl)
+        self.index_name = index_name
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(redis_url)
+        self._client.ping()
+        self._index_ready = False
+
+    def _key(self, prompt: str, scope: str) -> str:
+        return self.prefix + SemanticCache.make_key(prompt, scope).removeprefix("cache:")
+
+    def _ensure_index(self, dimensions: int) -> None:
+        """Create the HNSW index on first use (needs the embedding dimension)"""
+        if self._index_ready:
+            return
+        from redis.commands.search.field import TagField, TextField, VectorField
+        try:
+            from redis.commands.search.index_definition import IndexDefinition, IndexType
+        except ImportError:  # redis-py < 6
+            from redis.commands.search.indexDefinition import IndexDefinition, IndexType
+
+        try:
+            self._client.ft(self.index_name).info()
+        except Exception:
+            self._client.ft(self.index_name).create_index(
+                (
+                    TagField("scope"),
+                    TextField("prompt"),
+                    VectorField(
+                        "vector",
+                        "HNSW",
+                        {"TYPE": "FLOAT32", "DIM": dimensions, "DISTANCE_METRIC": "COSINE"},
+                    ),
+                ),
+                definition=IndexDefinition(prefix=[self.prefix], index_type=IndexType.HASH),
+            )
+        self._index_ready = True
+
+    def _write(self, pipe, prompt: str, response: str, scope: str, vector: np.ndarray) -> None:
+        key = self._key(prompt, scope)
+        pipe.hset(key, mapping={
+            "scope": scope,
+            "prompt": prompt,
+            "response": response,
+            "vector": vector.astype(np.float32).tobytes(),
+        })
+        pipe.expire(key, self.ttl)
+
+    def lookup(self, prompt: str, scope: str = "") -> Optional[str]:
+        """Find a cached answer for prompt (see SemanticCache.lookup)"""
+        from redis.commands.search.query import Query
+
+        try:
+            response = self._client.hget(self._key(prompt, scope), "response")
+            if response is not None:
+                return response.decode("utf-8")
+            if not self._index_ready:
+                self._client.ft(self.index_name).info()
+                self._index_ready = True
+
+            vector = _unit_vector(self.embed(normalize_prompt(prompt)))
+            if vector is None:
+                return None
+            query = (
+                Query(f"(@scope:{{{_escape_tag(scope)}}})=>[KNN 1 @vector $vec AS distance]")
+                .return_fields("response", "distance")
+                .dialect(2)
+            )
+            result = self._client.ft(self.index_name).search(query, query_params={"vec": vector.tobytes()})
+            for doc in result.docs:
+                if 1 - float(doc.distance) >= self.threshold:
+                    return doc.response
+        except Exception as e:
+            logger.debug("Redis semantic cache lookup failed: %s", e)
+        return None
+
+    def store(self, prompt: str, response: str, scope: str = "") -> None:
+        """Cache response as the answer to prompt"""
+        self.store_many([(prompt, response)], scope=scope)
+
+    def store_many(self, items: List[Tuple[str, str]], scope: str = "") -> int:
+        """Cache many (prompt, response) pairs in one pipeline (see SemanticCache.store_many)"""
+        if not items:
+            return 0
+        prompts = [normalize_prompt(prompt) for prompt, _ in items]
+        try:
+            if self.embed_many is not None and len(prompts) > 1:
+                embeddings = self.embed_many(prompts)
+            else:
+                embeddings = [self.embed(prompt) for prompt in prompts]
+            stored = 0
+            pipe = self._client.pipeline(transaction=False)
+            for (prompt, response), embedding in zip(items, embeddings):
+                vector = _unit_vector(embedding)
+                if vector is None:
+                    continue
+                self._ensure_index(vector.shape[0])
+                self._write(pipe, prompt, response, scope, vector)
+                stored += 1
+            pipe.execute()
+            return stored
+        except Exception as e:
+            logger.warning("⚠️ Could not store answers in Redis semantic cache: %s", e)
+            return 0
+
+    def clear(self) -> None:
+        """Drop all cached answers (for every worker)"""
+        try:
+            keys = list(self._client.scan_iter(match=self.prefix + "*", count=500))
+            if keys:
+                self._client.delete(*keys)
+        except Exception as e:
+            logger.warning("⚠️ Could not clear Redis semantic cache: %s", e)
+
+
+def create_semantic_cache(
+    embed: Callable[[str], List[float]],
+    embed_many: Optional[Callable[[List[str]], List[List[float]]]] = None,
+):
+    """
+    Create the response cache: Redis-backed when REDIS_URL is set and reachable,
+    otherwise in-process.
+
+    Args:
+        embed: Function returning the embedding of a text
+        embed_many: Optional function embedding many texts in one call
+
+    Returns:
+        RedisSemanticCache or SemanticCache
+    """
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        try:
+            cache = RedisSemanticCache(redis_url, embed=embed, embed_many=embed_many)
+            logger.info("✅ Using Redis semantic cache")
+            return cache
+        except Exception as e:
+            logger.warning("⚠️ Redis semantic cache unavailable (%s), using in-process cache", e)
+    return SemanticCache(embed=embed, embed_many=embed_many)
@@ -0,0 +1,43 @@
+"""Tests for GetCurrentJobsTool job matching"""
+import pytest
+
+pytest.importorskip("agno")
+pytest.importorskip("cachetools")
+pytest.importorskip("tenacity")
+
+from tools import JobCatalog  # noqa: E402
+
+
+JOBS = [
+    {"title": "Java Developer", "description": "Backend services", "skills": ["Java", "Spring"]},
+    {"title": "Frontend Engineer", "description": "Web apps", "skills": ["JavaScript", "React"]},
+    {"title": "Senior Developers Team Lead", "description": "Lead a team", "skills": ["Python"]},
+    {"title": "Data Analyst", "description": "Reports", "skills": ["SQL"]},
+]
+
+
+def _titles(catalog, terms):
+    return [catalog.jobs[pos].title for pos in catalog.match(terms)]
+
+
+def test_term_matches_inside_longer_words():
+    catalog = JobCatalog.build(JOBS)
+    assert _titles(catalog, ["java"]) == ["Java Developer", "Frontend Engineer"]
+
+
+def test_term_matches_plural():
+    catalog = JobCatalog.build(JOBS)
+    assert _titles(catalog, ["developer"]) == ["Java Developer", "Senior Developers Team Lead"]
+
+
+def test_phrase_and_ranking():
+    catalog = JobCatalog.build(JOBS)
+    # Java Developer contains both terms, so it ranks first
+    assert _titles(catalog, ["spring", "java", "sql"]) == ["Java Developer", "Frontend Engineer", "Data Analyst"]
+    assert _titles(catalog, ["web apps"]) == ["Frontend Engineer"]
+
+
+def test_no_terms_or_no_match():
+    catalog = JobCatalog.build(JOBS)
+    assert catalog.match([]) == []
+    assert catalog.match(["golang"]) == []
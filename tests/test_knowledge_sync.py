@@ -0,0 +1,97 @@
+"""Tests for knowledge_base.sync_knowledge_rows against agno's LanceDb row ids"""
+import json
+from dataclasses import dataclass, field
+
+import pytest
+
+pytest.importorskip("agno")
+pytest.importorskip("lancedb")
+pytest.importorskip("openai")
+pytest.importorskip("gspread")
+
+from agno.knowledge import Knowledge  # noqa: E402
+from agno.knowledge.chunking.row import RowChunking  # noqa: E402
+from agno.knowledge.embedder.base import Embedder  # noqa: E402
+from agno.knowledge.reader.csv_reader import CSVReader  # noqa: E402
+from agno.utils.string import generate_id  # noqa: E402
+from agno.vectordb.lancedb import LanceDb  # noqa: E402
+
+from knowledge_base import _content_hash, _read_csv_rows, _row_id, sync_knowledge_rows  # noqa: E402
+
+
+@dataclass
+class FakeEmbedder(Embedder):
+    """Fixed-vector embedder so the tests need no API key; records the texts it embeds"""
+    dimensions: int = 4
+    embedded: list = field(default_factory=list)
+
+    def get_embedding(self, text):
+        self.embedded.append(text)
+        return [float(len(text)), 1.0, 0.0, 0.0]
+
+    def get_embedding_and_usage(self, text):
+        return self.get_embedding(text), None
+
+    async def async_get_embedding(self, text):
+        return self.get_embedding(text)
+
+    async def async_get_embedding_and_usage(self, text):
+        return self.get_embedding(text), None
+
+
+def _write_csv(path, rows):
+    path.write_text("question,answer\n" + "".join(f"{q},{a}\n" for q, a in rows), encoding="utf-8")
+
+
+def _table_rows(vector_db):
+    table = vector_db.table
+    data = table.search().limit(table.count_rows()).to_arrow().to_pydict()
+    return {row_id: json.loads(payload) for row_id, payload in zip(data["id"], data["payload"])}
+
+
+def _row_ids(csv_file):
+    return {document.content: _row_id(document.content) for document in _read_csv_rows(csv_file)}
+
+
+@pytest.fixture
+def knowledge(tmp_path):
+    vector_db = LanceDb(uri=str(tmp_path / "lancedb"), table_name="knowledge", embedder=FakeEmbedder())
+    return Knowledge(vector_db=vector_db)
+
+
+def test_row_ids_match_agno_ingest(tmp_path, knowledge):
+    csv_file = str(tmp_path / "knowledge.csv")
+    _write_csv(tmp_path / "knowledge.csv", [("Lương?", "Thỏa thuận"), ("Địa chỉ?", "Hà Nội")])
+    knowledge.add_content(path=csv_file, reader=CSVReader(chunking_strategy=RowChunking()))
+    
+    rows = _table_rows(knowledge.vector_db)
+    assert set(rows) == {_row_id(document.content) for document in _read_csv_rows(csv_file)}
+    for payload in rows.values():
+        assert payload["content_hash"] == _content_hash(csv_file)
+        assert payload["content_id"] == generate_id(_content_hash(csv_file))
+
+
+def test_sync_embeds_only_changed_rows(tmp_path, knowledge):
+    csv_file = str(tmp_path / "knowledge.csv")
+    _write_csv(tmp_path / "knowledge.csv", [("Lương?", "Thỏa thuận"), ("Địa chỉ?", "Hà Nội")])
+    knowledge.add_content(path=csv_file, reader=CSVReader(chunking_strategy=RowChunking()))
+    old_ids = _row_ids(csv_file)
+    before = _table_rows(knowledge.vector_db)
+    
+    _write_csv(tmp_path / "knowledge.csv", [("Lương?", "Thỏa thuận"), ("Địa chỉ?", "TP. Hồ Chí Minh")])
+    new_ids = _row_ids(csv_file)
+    embedder = knowledge.vector_db.embedder
+    embedder.embedded.clear()
+    assert sync_knowledge_rows(knowledge.vector_db, csv_file)
+    
+    changed = [content for content in new_ids if content not in old_ids]
+    unchanged_ids = [row_id for content, row_id in new_ids.items() if content in old_ids]
+    stale_ids = [row_id for content, row_id in old_ids.items() if content not in new_ids]
+    assert len(changed) == len(stale_ids) == 1 and unchanged_ids
+    
+    # Only the edited row was embedded; the stale row is gone, unchanged rows untouched
+    assert embedder.embedded == changed
+    rows = _table_rows(knowledge.vector_db)
+    assert set(rows) == set(new_ids.values())
+    assert not set(stale_ids) & set(rows)
+    assert all(rows[row_id] == before[row_id] for row_id in unchanged_ids)
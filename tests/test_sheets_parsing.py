@@ -0,0 +1,24 @@
+"""Tests for google_sheets_loader list column parsing"""
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("tenacity")
+
+from google_sheets_loader import _parse_list_column  # noqa: E402
+
+
+def _parse(*cells):
+    return _parse_list_column(pd.Series(list(cells), dtype=object)).tolist()
+
+
+def test_comma_separated_cell_splits_on_commas_only():
+    assert _parse("Python, SQL,\nDocker") == [["Python", "SQL", "Docker"]]
+    assert _parse("Lương tháng 13,\nBảo hiểm\nsức khỏe") == [["Lương tháng 13", "Bảo hiểm\nsức khỏe"]]
+
+
+def test_cell_without_comma_splits_on_newlines():
+    assert _parse("Python\nSQL\n\nDocker") == [["Python", "SQL", "Docker"]]
+
+
+def test_single_item_and_empty_cells():
+    assert _parse("  Python  ", "", None) == [["Python"], [], []]
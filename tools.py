@@ -1,16 +1,115 @@
 """Custom tools for Recruitment Chatbot"""
 import os
+import atexit
+import hashlib
 import json
 import logging
-from typing import Optional
-from datetime import datetime
-import gspread
-from google.oauth2.service_account import Credentials
-import requests
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Optional
+from cachetools import TTLCache
+from tenacity import (
+    before_sleep_log,
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 from agno.tools import Toolkit
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib json module
+    orjson = None
+
+# gspread/google-auth and httpx are imported by the code paths that use
+# them, so loading the jobs tool doesn't pay for the Sheets and HTTP stacks
+if TYPE_CHECKING:
+    import httpx
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Header row of the user info table (timestamp, name, email, phone, profile_link,
+# job_title); pinning values.append to it lets Sheets find the table without
+# scanning the whole tab
+USER_INFO_TABLE_RANGE = "A1:F1"
+
+# Format of the submission timestamp written to the sheet and the fallback file
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Local fallback store: JSON Lines, one user info record appended per line
+USER_INFO_FILE = "tmp/user_info.jsonl"
+# Earlier fallback store (one JSON array); its records are moved into
+# USER_INFO_FILE on the first local save, then it is renamed to *.migrated
+LEGACY_USER_INFO_FILE = "tmp/user_info.json"
+
+# Agno runs the tool calls of one turn concurrently (threads in arun), so
+# appends to the fallback file are serialized to keep lines from interleaving
+# (sheet appends are atomic on the server side)
+_user_info_write_lock = threading.Lock()
+
+
+def _dump_line(record: dict) -> bytes:
+    """One JSON Lines record as UTF-8 bytes (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _load_json(raw: bytes):
+    """Parse a JSON document (orjson when available)"""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+_legacy_user_info_checked = False
+
+
+def _migrate_legacy_user_info() -> None:
+    """
+    Move the records of LEGACY_USER_INFO_FILE into USER_INFO_FILE (caller holds _user_info_write_lock).
+    
+    Legacy records are older, so they go before the lines already in
+    USER_INFO_FILE. Checked once per process.
+    """
+    global _legacy_user_info_checked
+    if _legacy_user_info_checked:
+        return
+    _legacy_user_info_checked = True
+    if not os.path.exists(LEGACY_USER_INFO_FILE):
+        return
+    try:
+        with open(LEGACY_USER_INFO_FILE, "rb") as f:
+            records = _load_json(f.read()) or []
+        existing = b""
+        if os.path.exists(USER_INFO_FILE):
+            with open(USER_INFO_FILE, "rb") as f:
+                existing = f.read()
+        tmp_path = USER_INFO_FILE + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(_dump_line(record) for record in records) + existing)
+        os.replace(tmp_path, USER_INFO_FILE)
+        os.replace(LEGACY_USER_INFO_FILE, LEGACY_USER_INFO_FILE + ".migrated")
+        logger.info("✅ Migrated %d user info record(s) from %s to %s", len(records), LEGACY_USER_INFO_FILE, USER_INFO_FILE)
+    except Exception as e:
+        logger.error("❌ Could not migrate %s: %s", LEGACY_USER_INFO_FILE, e, exc_info=True)
+
+# Authorized client and opened worksheet are reused for this many seconds, then
+# rebuilt shortly before the service account's 1h access token would expire
+SHEETS_HANDLE_TTL = 50 * 60
+# Sheets API statuses after which the cached client/worksheet are rebuilt: auth
+# errors plus 404 (spreadsheet or tab deleted/replaced since it was opened)
+SHEETS_HANDLE_ERROR_CODES = frozenset({401, 403, 404})
+# Background threads sending user info rows to Google Sheets
+SHEETS_WRITE_WORKERS = 2
+# Default batching of user info rows: a batch is sent this many seconds after its
+# first row, or as soon as it holds this many rows, in one append_rows call
+SHEETS_FLUSH_INTERVAL = 0.5
+SHEETS_BATCH_MAX_ROWS = 10
+
 
 class CollectUserInfoTool(Toolkit):
     """Tool to collect and save user information to Google Sheets"""
@@ -21,8 +120,12 @@ class CollectUserInfoTool(Toolkit):
         spreadsheet_id: Optional[str] = None,
         user_info_sheet_name: Optional[str] = None,
         name: str = "collect_user_info_tool",
+        flush_interval: float = SHEETS_FLUSH_INTERVAL,
+        max_batch_size: int = SHEETS_BATCH_MAX_ROWS,
     ):
         super().__init__(name=name)
+        self.flush_interval = flush_interval
+        self.max_batch_size = max(1, max_batch_size)
         self.credentials_file = credentials_file or os.getenv("GOOGLE_SHEETS_CREDENTIALS_FILE")
         self.spreadsheet_id = spreadsheet_id or os.getenv("GOOGLE_SHEETS_SPREADSHEET_ID")
         self.user_info_sheet_name = user_info_sheet_name or os.getenv("INFO_SHEET_ID", "UserInfo")
@@ -32,60 +135,153 @@ class CollectUserInfoTool(Toolkit):
         logger.info("[GOOGLE SHEETS TOOL]   - Credentials file: %s", self.credentials_file)
         logger.info("[GOOGLE SHEETS TOOL]   - Spreadsheet ID: %s", self.spreadsheet_id)
         logger.info("[GOOGLE SHEETS TOOL]   - User Info Sheet: %s", self.user_info_sheet_name)
-        logger.info("[GOOGLE SHEETS TOOL]   - Credentials file exists: %s", 
-                   os.path.exists(self.credentials_file) if self.credentials_file else False)
+        # Checked once: save_user_info reads the flag instead of a stat() per save
+        self._creds_exists = bool(self.credentials_file) and os.path.isfile(self.credentials_file)
+        logger.info("[GOOGLE SHEETS TOOL]   - Credentials file exists: %s", self._creds_exists)
+        
+        # Cached gspread handles (see _get_worksheet)
+        self._credentials = None
+        self._client = None
+        self._worksheet = None
+        self._handles_created_at = 0.0
+        # _client_lock guards the handles; _open_lock lets one thread reopen them
+        # (network calls) while others keep using the current ones
+        self._client_lock = threading.Lock()
+        self._open_lock = threading.Lock()
+        # Sheets writes run off the chat turn (see _write_to_sheets)
+        self._executor = ThreadPoolExecutor(max_workers=SHEETS_WRITE_WORKERS, thread_name_prefix="sheets")
+        # Rows waiting for the next batched append (see _enqueue_row)
+        self._pending: list[list] = []
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        atexit.register(self._flush_pending, wait=True)
         
         # Register the function
         self.register(self.save_user_info)
     
-    def _get_credentials_from_env(self):
-        """Build credentials dict from environment variables"""
-        return {
-            "type": os.getenv("GOOGLE_SHEETS_CREDENTIALS_TYPE"),
-            "project_id": os.getenv("GOOGLE_SHEETS_CREDENTIALS_PROJECT_ID"),
-            "private_key_id": os.getenv("GOOGLE_SHEETS_CREDENTIALS_PRIVATE_KEY_ID"),
-            "private_key": os.getenv("GOOGLE_SHEETS_CREDENTIALS_PRIVATE_KEY", "").replace("\\n", "\n"),
-            "client_email": os.getenv("GOOGLE_SHEETS_CREDENTIALS_CLIENT_EMAIL"),
-            "client_id": os.getenv("GOOGLE_SHEETS_CREDENTIALS_CLIENT_ID"),
-            "auth_uri": os.getenv("GOOGLE_SHEETS_CREDENTIALS_AUTH_URI"),
-            "token_uri": os.getenv("GOOGLE_SHEETS_CREDENTIALS_TOKEN_URI"),
-            "auth_provider_x509_cert_url": os.getenv("GOOGLE_SHEETS_CREDENTIALS_AUTH_PROVIDER_X509_CERT_URL"),
-            "client_x509_cert_url": os.getenv("GOOGLE_SHEETS_CREDENTIALS_CLIENT_X509_CERT_URL"),
-            "universe_domain": os.getenv("GOOGLE_SHEETS_CREDENTIALS_UNIVERSE_DOMAIN", "googleapis.com")
-        }
+    def _get_credentials(self):
+        """
+        Service account credentials, parsed once and kept on the tool.
+        
+        The PEM key is parsed (and the RSA signer built) only here; google-auth
+        refreshes the access token on the same object, so rebuilding the client
+        after SHEETS_HANDLE_TTL reuses it.
+        
+        Returns:
+            google.oauth2.service_account.Credentials, or None if neither the
+            environment variables nor the JSON file are configured
+        """
+        if self._credentials is not None:
+            return self._credentials
+        
+        from google.oauth2.service_account import Credentials
+        from google_sheets_loader import SCOPES, _get_credentials_from_env
+        
+        # Try to use credentials from environment variables first (dict built once per process)
+        creds_dict = _get_credentials_from_env()
+        if creds_dict.get("client_email") and creds_dict.get("private_key"):
+            logger.info("[GOOGLE SHEETS TOOL] Using credentials from environment variables")
+            self._credentials = Credentials.from_service_account_info(creds_dict, scopes=SCOPES)
+        # Fallback to JSON file if environment variables not set
+        elif self._creds_exists:
+            logger.info("[GOOGLE SHEETS TOOL] Using credentials from JSON file: %s", self.credentials_file)
+            self._credentials = Credentials.from_service_account_file(self.credentials_file, scopes=SCOPES)
+        else:
+            logger.error("[GOOGLE SHEETS TOOL] No valid credentials found (neither env vars nor JSON file)")
+        return self._credentials
     
     def _get_google_sheets_client(self):
-        """Initialize Google Sheets client"""
+        """Create a Google Sheets client (None if there are no credentials or it fails)"""
         try:
+            import gspread
+            
             logger.info("Initializing Google Sheets client...")
-            scope = [
-                'https://spreadsheets.google.com/feeds',
-                'https://www.googleapis.com/auth/drive'
-            ]
-            
-            # Try to use credentials from environment variables first
-            creds_dict = self._get_credentials_from_env()
-            if creds_dict.get("client_email") and creds_dict.get("private_key"):
-                logger.info("[GOOGLE SHEETS TOOL] Using credentials from environment variables")
-                creds = Credentials.from_service_account_info(creds_dict, scopes=scope)
-                client = gspread.authorize(creds)
-                logger.info("Google Sheets client initialized successfully with env vars")
-                return client
-            # Fallback to JSON file if environment variables not set
-            elif self.credentials_file and os.path.exists(self.credentials_file):
-                logger.info("[GOOGLE SHEETS TOOL] Using credentials from JSON file: %s", self.credentials_file)
-                creds = Credentials.from_service_account_file(self.credentials_file, scopes=scope)
-                client = gspread.authorize(creds)
-                logger.info("Google Sheets client initialized successfully with JSON file")
-                return client
-            else:
-                logger.error("[GOOGLE SHEETS TOOL] No valid credentials found (neither env vars nor JSON file)")
+            creds = self._get_credentials()
+            if creds is None:
                 return None
+            # Same pooled, retrying AuthorizedSession the loaders use: keep-alive to
+            # sheets.googleapis.com for the background writers, dropped connections retried
+            from google_sheets_loader import GoogleSheetsLoader
+            
+            client = gspread.authorize(creds, session=GoogleSheetsLoader._create_session(creds))
+            logger.info("Google Sheets client initialized successfully")
+            return client
                 
         except Exception as e:
             logger.error("Error connecting to Google Sheets: %s", e)
             return None
     
+    @staticmethod
+    def _close_client(client) -> None:
+        """Close the HTTP connection pool of a client that is no longer used"""
+        if client is None:
+            return
+        try:
+            client.http_client.session.close()
+        except Exception as e:
+            logger.debug("[GOOGLE SHEETS TOOL] Error closing old Sheets session: %s", e)
+    
+    def _get_worksheet(self):
+        """
+        User info worksheet, opened once and shared by later saves.
+        
+        The client and worksheet handles are rebuilt after SHEETS_HANDLE_TTL
+        seconds, so open_by_key/worksheet (one API GET each) and the token
+        signing only happen on the first save and about once an hour after that.
+        One thread reopens them, outside _client_lock; other saves keep using the
+        expiring handles meanwhile (only the very first open makes them wait).
+        
+        Returns:
+            gspread.Worksheet, or None if no client could be created
+        """
+        with self._client_lock:
+            current = self._worksheet
+            if current is not None and time.monotonic() - self._handles_created_at < SHEETS_HANDLE_TTL:
+                return current
+        
+        if not self._open_lock.acquire(blocking=current is None):
+            return current
+        try:
+            with self._client_lock:
+                if self._worksheet is not None and time.monotonic() - self._handles_created_at < SHEETS_HANDLE_TTL:
+                    return self._worksheet
+            
+            client = self._get_google_sheets_client()
+            if not client:
+                return None
+            logger.info("[GOOGLE SHEETS TOOL] Opening spreadsheet with ID: %s, sheet: %s", 
+                       self.spreadsheet_id, self.user_info_sheet_name)
+            try:
+                worksheet = client.open_by_key(self.spreadsheet_id).worksheet(self.user_info_sheet_name)
+            except Exception:
+                self._close_client(client)
+                raise
+            
+            with self._client_lock:
+                old_client = self._client
+                self._client, self._worksheet = client, worksheet
+                self._handles_created_at = time.monotonic()
+            self._close_client(old_client)
+            return worksheet
+        finally:
+            self._open_lock.release()
+    
+    def _refresh_client(self, exc: Exception) -> None:
+        """
+        Drop the cached client and worksheet after an auth or not-found error so the next save reconnects.
+        
+        Rate limits and server errors keep the handles: they are still valid and
+        reopening would only add open_by_key/worksheet calls to a struggling API.
+        """
+        from gspread.exceptions import APIError
+        
+        if isinstance(exc, APIError) and exc.response.status_code in SHEETS_HANDLE_ERROR_CODES:
+            logger.warning("[GOOGLE SHEETS TOOL] API error %d, reconnecting on next save", exc.response.status_code)
+            with self._client_lock:
+                old_client = self._client
+                self._client = self._worksheet = None
+            self._close_client(old_client)
+    
     def save_user_info(
         self,
         name: str,
@@ -107,7 +303,8 @@ class CollectUserInfoTool(Toolkit):
         Returns:
             str: Success or error message
         """
-        logger.info("[GOOGLE SHEETS TOOL] Called save_user_info with name='%s', email='%s', phone='%s', profile_link='%s', job_title='%s'", name, email, phone, profile_link, job_title)
+        # Per-save traces carry personal data, so they stay at DEBUG
+        logger.debug("[GOOGLE SHEETS TOOL] Called save_user_info with name='%s', email='%s', phone='%s', profile_link='%s', job_title='%s'", name, email, phone, profile_link, job_title)
         
         try:
             # Validate required fields
@@ -116,50 +313,109 @@ class CollectUserInfoTool(Toolkit):
                 return "Lỗi: Tên và email là bắt buộc. Vui lòng cung cấp đầy đủ thông tin."
             
             # If credentials not configured, save to local file as fallback
-            logger.debug("[GOOGLE SHEETS TOOL] Checking credentials file: %s", self.credentials_file)
-            logger.debug("[GOOGLE SHEETS TOOL] Credentials file exists: %s", 
-                        os.path.exists(self.credentials_file) if self.credentials_file else False)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[GOOGLE SHEETS TOOL] Checking credentials file: %s", self.credentials_file)
+                logger.debug("[GOOGLE SHEETS TOOL] Credentials file exists: %s", self._creds_exists)
             
             if not self.credentials_file:
                 logger.warning("[GOOGLE SHEETS TOOL] Credentials file path is None, falling back to local file")
                 return self._save_to_local_file(name, email, phone, profile_link, job_title)
             
-            if not os.path.exists(self.credentials_file):
+            if not self._creds_exists:
                 logger.warning("[GOOGLE SHEETS TOOL] Credentials file does not exist at path: %s, falling back to local file", 
                              self.credentials_file)
                 return self._save_to_local_file(name, email, phone, profile_link, job_title)
             
-            # Connect to Google Sheets
-            client = self._get_google_sheets_client()
-            if not client:
-                logger.warning("[GOOGLE SHEETS TOOL] Failed to get Google Sheets client, falling back to local file")
-                return self._save_to_local_file(name, email, phone, profile_link, job_title)
-            
-            # Open spreadsheet and get the user info sheet
-            logger.info("[GOOGLE SHEETS TOOL] Opening spreadsheet with ID: %s, sheet: %s", 
-                       self.spreadsheet_id, self.user_info_sheet_name)
-            spreadsheet = client.open_by_key(self.spreadsheet_id)
-            worksheet = spreadsheet.worksheet(self.user_info_sheet_name)
-
-            # Prepare data
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            # Ghi lên Sheets ở background: lượt chat trả lời ngay, lỗi thì _write_to_sheets
+            # tự lưu vào file local nên không mất dữ liệu
+            timestamp = time.strftime(TIMESTAMP_FORMAT)
             row_data = [timestamp, name, email, phone or "", profile_link or "", job_title or ""]
-
-            # Tìm hàng trống đầu tiên trong cột A
-            all_values = worksheet.col_values(1)  # Lấy tất cả giá trị cột A
-            next_row = len(all_values) + 1
-
-            # Insert vào hàng cụ thể, bắt đầu từ cột A
-            logger.info("[GOOGLE SHEETS TOOL] Inserting row at position %d: %s", next_row, row_data)
-            worksheet.insert_row(row_data, next_row, value_input_option='USER_ENTERED')
-
-            logger.info("[GOOGLE SHEETS TOOL] Successfully saved user info for '%s' to Google Sheets", name)
+            self._enqueue_row(row_data)
+            
+            logger.debug("[GOOGLE SHEETS TOOL] Queued user info for '%s' to Google Sheets", name)
             return f"✅ Đã lưu thông tin của {name} thành công! Bộ phận tuyển dụng sẽ liên hệ với bạn sớm nhất."
             
         except Exception as e:
             logger.error("[GOOGLE SHEETS TOOL] Error saving to Google Sheets: %s", e, exc_info=True)
             return self._save_to_local_file(name, email, phone, profile_link, job_title)
     
+    def _enqueue_row(self, row_data: list) -> None:
+        """Queue a row; the batch is flushed flush_interval s after its first row or once it is full"""
+        with self._pending_lock:
+            self._pending.append(row_data)
+            if len(self._pending) < self.max_batch_size:
+                # Timer started by the batch's first row; later rows don't push it back,
+                # so a steady trickle of saves can't hold a row indefinitely
+                if self._flush_timer is None:
+                    self._flush_timer = threading.Timer(self.flush_interval, self._flush_pending)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
+                return
+        self._flush_pending()
+    
+    def _flush_pending(self, wait: bool = False) -> None:
+        """
+        Send all queued rows to the sheet in one append_rows call.
+        
+        Args:
+            wait: Write on the calling thread instead of the executor (used at exit)
+        """
+        with self._pending_lock:
+            rows, self._pending = self._pending, []
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        if not rows:
+            return
+        if wait:
+            self._write_to_sheets(rows)
+        else:
+            self._executor.submit(self._write_to_sheets, rows)
+    
+    def _write_to_sheets(self, rows: list) -> None:
+        """
+        Append user info rows to the sheet in a single request (runs on self._executor).
+        
+        Rate limits and server errors are retried with exponential backoff; rows
+        that still can't be written go to the local fallback file.
+        
+        Args:
+            rows: List of [timestamp, name, email, phone, profile_link, job_title]
+        """
+        from google_sheets_loader import _with_retry
+        
+        try:
+            # Connect to Google Sheets (cached client + worksheet)
+            worksheet = self._get_worksheet()
+            if not worksheet:
+                logger.warning("[GOOGLE SHEETS TOOL] Failed to get Google Sheets client, falling back to local file")
+                self._save_rows_to_local_file(rows)
+                return
+            
+            # values.append: Sheets tự tìm hàng trống sau bảng có header ở A1:F1 và ghi cả lô
+            # trong một request, không cần đọc cột A trước hay dịch các hàng phía dưới.
+            # Chạy ở background nên có thể chờ backoff khi bị 429/5xx mà không chặn lượt chat
+            logger.debug("[GOOGLE SHEETS TOOL] Appending %d row(s): %s", len(rows), rows)
+            _with_retry(worksheet.append_rows)(
+                rows,
+                value_input_option='USER_ENTERED',
+                insert_data_option='INSERT_ROWS',
+                table_range=USER_INFO_TABLE_RANGE,
+                include_values_in_response=False,
+            )
+            
+            logger.debug("[GOOGLE SHEETS TOOL] Successfully saved %d user info row(s) to Google Sheets", len(rows))
+            
+        except Exception as e:
+            logger.error("[GOOGLE SHEETS TOOL] Error saving to Google Sheets: %s", e, exc_info=True)
+            self._refresh_client(e)
+            self._save_rows_to_local_file(rows)
+    
+    def _save_rows_to_local_file(self, rows: list) -> None:
+        """Fallback for a batch the sheet didn't accept"""
+        for timestamp, name, email, phone, profile_link, job_title in rows:
+            self._save_to_local_file(name, email, phone, profile_link, job_title, timestamp=timestamp)
+    
     def _save_to_local_file(
         self,
         name: str,
@@ -167,22 +423,24 @@ class CollectUserInfoTool(Toolkit):
         phone: Optional[str] = None,
         profile_link: Optional[str] = None,
         job_title: Optional[str] = None,
+        timestamp: Optional[str] = None,
     ) -> str:
-        """Fallback: Save to local JSON file if Google Sheets is not available"""
-        logger.info("[GOOGLE SHEETS TOOL] Using fallback: saving to local file for user '%s'", name)
+        """
+        Fallback: Append to the local JSON Lines file if Google Sheets is not available.
+        
+        Args:
+            timestamp: Submission time of a queued row (now if None), so rows the
+                sheet rejected keep the time the user sent them
+        """
+        logger.debug("[GOOGLE SHEETS TOOL] Using fallback: saving to local file for user '%s'", name)
         try:
-            os.makedirs("tmp", exist_ok=True)
-            file_path = "tmp/user_info.json"
+            from google_sheets_loader import ensure_dir
             
-            # Load existing data
-            if os.path.exists(file_path):
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-            else:
-                data = []
+            file_path = USER_INFO_FILE
+            ensure_dir(os.path.dirname(file_path))  # makedirs once per process
             
-            # Append new data
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            if timestamp is None:
+                timestamp = time.strftime(TIMESTAMP_FORMAT)
             user_data = {
                 "timestamp": timestamp,
                 "name": name,
@@ -191,13 +449,15 @@ class CollectUserInfoTool(Toolkit):
                 "profile_link": profile_link or "",
                 "job_title": job_title or ""
             }
-            data.append(user_data)
+            line = _dump_line(user_data)
             
-            # Save data
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            # Chỉ ghi thêm một dòng, không đọc lại / ghi đè toàn bộ file
+            with _user_info_write_lock:
+                _migrate_legacy_user_info()
+                with open(file_path, "ab") as f:
+                    f.write(line)
             
-            logger.info("[GOOGLE SHEETS TOOL] Successfully saved user info to local file: %s", file_path)
+            logger.debug("[GOOGLE SHEETS TOOL] Successfully saved user info to local file: %s", file_path)
             logger.debug("[GOOGLE SHEETS TOOL] Saved data: %s", user_data)
             return f"✅ Đã lưu thông tin của {name} thành công! Bộ phận tuyển dụng sẽ liên hệ với bạn sớm nhất."
             
@@ -206,6 +466,93 @@ class CollectUserInfoTool(Toolkit):
             return f"❌ Lỗi khi lưu thông tin: {str(e)}"
 
 
+# Loaded jobs are served from memory for this many seconds, then refreshed in
+# the background while the expired jobs keep being served
+JOBS_CACHE_TTL = 10 * 60
+# Seconds the first load waits for Google Sheets before answering from the local jobs file
+JOBS_SHEETS_WAIT = 2.0
+# Jobs listed per reply by default; the rest are summarized in one line
+JOBS_TOP_K = 10
+
+
+@dataclass(frozen=True, slots=True)
+class Job:
+    """One job opening, with the display defaults of the jobs list already applied"""
+    title: str
+    location: str
+    type: str
+    salary: str
+    description: str
+    skills: tuple[str, ...]
+    contact: str
+    
+    @classmethod
+    def from_dict(cls, job: dict) -> "Job":
+        """Build a Job from a jobs.json / Google Sheets record"""
+        return cls(
+            title=job.get('title', 'N/A'),
+            location=job.get('location', 'N/A'),
+            type=job.get('type', 'N/A'),
+            salary=job.get('salary', 'Thỏa thuận'),
+            description=job.get('description', 'N/A'),
+            skills=tuple(job.get('skills') or ()),
+            contact=job.get('contact', ''),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class JobCatalog:
+    """
+    Immutable snapshot of the loaded jobs, safe to share between threads.
+    
+    blobs holds the lowercased "title description skills" text per job, the
+    text search terms are matched against as substrings.
+    """
+    jobs: tuple[Job, ...]
+    blobs: tuple[str, ...]
+    expires_at: float
+    
+    @classmethod
+    def build(cls, jobs: list) -> "JobCatalog":
+        """Convert job dicts and precompute their lowercased search blobs"""
+        blobs = tuple(
+            f"{job.get('title', '')} {job.get('description', '')} {' '.join(job.get('skills', []))}".lower()
+            for job in jobs
+        )
+        return cls(
+            jobs=tuple(Job.from_dict(job) for job in jobs),
+            blobs=blobs,
+            expires_at=time.monotonic() + JOBS_CACHE_TTL,
+        )
+    
+    def match(self, search_terms: list) -> list:
+        """
+        Positions of the jobs matching any search term, most relevant first.
+        
+        A job matches when any term is a substring of its blob ("java" also
+        matches "javascript", "developer" matches "developers"). One regex
+        alternation of all terms finds the matching blobs in a single pass
+        each; only those are then checked term by term for ranking.
+        
+        Returns:
+            Positions ordered by the number of distinct terms they contain,
+            then by their order in the jobs list
+        """
+        terms = list(dict.fromkeys(search_terms))
+        if not terms:
+            return []
+        pattern = re.compile("|".join(map(re.escape, terms)))
+        hits = {
+            pos: sum(term in blob for term in terms)
+            for pos, blob in enumerate(self.blobs)
+            if pattern.search(blob)
+        }
+        return sorted(hits, key=lambda pos: (-hits[pos], pos))
+
+
+_EMPTY_CATALOG = JobCatalog(jobs=(), blobs=(), expires_at=0.0)
+
+
 class GetCurrentJobsTool(Toolkit):
     """Tool to get current job openings from Google Sheets or local file"""
     
@@ -213,58 +560,170 @@ class GetCurrentJobsTool(Toolkit):
         self, 
         jobs_file: str = "data/jobs.json", 
         name: str = "get_current_jobs_tool",
-        use_google_sheets: bool = True
+        use_google_sheets: bool = True,
+        top_k: int = JOBS_TOP_K,
     ):
         super().__init__(name=name)
         self.jobs_file = jobs_file
         self.use_google_sheets = use_google_sheets
-        self._jobs_cache = None
+        self.top_k = max(1, top_k)
+        # JobCatalog of the last successful load, refreshed once it expires
+        self._jobs_cache: Optional[JobCatalog] = None
+        # Sheets and local-file loads run side by side (see _load_jobs)
+        self._load_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="jobs")
+        # Held by the first load (later callers wait for it) and by a background refresh
+        self._first_load_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
         
         # Register the function
         self.register(self.get_current_jobs)
     
-    def _load_jobs(self) -> list:
-        """Load jobs from Google Sheets or local file"""
-        # Return cached jobs if available
-        if self._jobs_cache is not None:
-            return self._jobs_cache
+    def _load_from_sheets(self, remote_modified: Optional[str]) -> Optional[JobCatalog]:
+        """
+        Download the jobs tab and refresh the local jobs file.
         
-        jobs = []
+        Args:
+            remote_modified: Spreadsheet modifiedTime read before the download, stored with the file
         
-        # Try to load from Google Sheets first
-        if self.use_google_sheets:
-            try:
-                logger.info("[GET JOBS TOOL] Attempting to load jobs from Google Sheets...")
-                from google_sheets_loader import GoogleSheetsLoader
-                
-                sheets_loader = GoogleSheetsLoader()
-                jobs = sheets_loader.load_jobs_data()
-                
-                if jobs:
-                    # Save to local file as cache
-                    sheets_loader.save_jobs_to_json(self.jobs_file)
-                    logger.info("[GET JOBS TOOL] ✅ Loaded %d jobs from Google Sheets", len(jobs))
-                    self._jobs_cache = jobs
-                    return jobs
-                else:
-                    logger.warning("[GET JOBS TOOL] ⚠️ No jobs loaded from Google Sheets, trying local file")
-            except Exception as e:
-                logger.warning("[GET JOBS TOOL] ⚠️ Error loading from Google Sheets: %s. Trying local file", e)
-        
-        # Fallback to local file
+        Returns:
+            JobCatalog, or None if Sheets returned nothing or failed
+        """
+        try:
+            logger.info("[GET JOBS TOOL] Attempting to load jobs from Google Sheets...")
+            from google_sheets_loader import GoogleSheetsLoader, write_cached_modified
+            
+            sheets_loader = GoogleSheetsLoader()
+            jobs = sheets_loader.load_jobs_data(modified_time=remote_modified)
+            
+            if jobs:
+                # Save to local file as cache, tagged with the version it holds
+                if sheets_loader.save_jobs_to_json(self.jobs_file, jobs=jobs) and remote_modified:
+                    write_cached_modified(self.jobs_file, remote_modified)
+                logger.info("[GET JOBS TOOL] ✅ Loaded %d jobs from Google Sheets", len(jobs))
+                return JobCatalog.build(jobs)
+            logger.warning("[GET JOBS TOOL] ⚠️ No jobs loaded from Google Sheets, trying local file")
+        except Exception as e:
+            logger.warning("[GET JOBS TOOL] ⚠️ Error loading from Google Sheets: %s. Trying local file", e)
+        return None
+    
+    def _load_from_local(self) -> Optional[JobCatalog]:
+        """Read the local jobs file; None if it is missing or unreadable"""
         try:
             if os.path.exists(self.jobs_file):
-                with open(self.jobs_file, "r", encoding="utf-8") as f:
-                    jobs_data = json.load(f)
+                with open(self.jobs_file, "rb") as f:
+                    jobs_data = _load_json(f.read())
                 jobs = jobs_data.get("jobs", [])
                 logger.info("[GET JOBS TOOL] ✅ Loaded %d jobs from local file: %s", len(jobs), self.jobs_file)
-                self._jobs_cache = jobs
-            else:
-                logger.warning("[GET JOBS TOOL] ⚠️ Local jobs file not found: %s", self.jobs_file)
+                return JobCatalog.build(jobs)
+            logger.warning("[GET JOBS TOOL] ⚠️ Local jobs file not found: %s", self.jobs_file)
         except Exception as e:
             logger.error("[GET JOBS TOOL] ❌ Error loading from local file: %s", e)
+        return None
+    
+    def _load_if_changed(self) -> tuple[bool, Optional[JobCatalog]]:
+        """
+        Download the jobs tab if the spreadsheet changed since the jobs file was written.
+        
+        The change check is one Drive metadata call instead of downloading the rows.
+        
+        Returns:
+            Tuple of (changed, JobCatalog or None if unchanged or the download failed);
+            changed is True when the check itself failed
+        """
+        remote_modified = None
+        try:
+            from google_sheets_loader import GoogleSheetsLoader, read_cached_modified
+            
+            remote_modified = GoogleSheetsLoader().get_last_modified()
+            if (
+                remote_modified is not None
+                and os.path.exists(self.jobs_file)
+                and remote_modified <= read_cached_modified(self.jobs_file)
+            ):
+                return False, None
+        except Exception as e:
+            logger.warning("[GET JOBS TOOL] ⚠️ Could not check Google Sheets for changes: %s", e)
+        return True, self._load_from_sheets(remote_modified)
+    
+    def _install_late_sheets_load(self, future: Future) -> None:
+        """Done-callback of a Sheets load that outlasted JOBS_SHEETS_WAIT: cache its result for the next call"""
+        catalog = None if future.cancelled() or future.exception() else future.result()[1]
+        if catalog is not None:
+            logger.info("[GET JOBS TOOL] Google Sheets load finished late, cached %d jobs", len(catalog.jobs))
+            self._jobs_cache = catalog
+    
+    def _load_jobs(self) -> JobCatalog:
+        """
+        Get the current jobs.
+        
+        Expired jobs are still returned while one background refresh checks
+        Google Sheets, so a tool call never waits on Drive once jobs are loaded.
+        """
+        cached = self._jobs_cache
+        if cached is not None:
+            if time.monotonic() >= cached.expires_at:
+                self._start_refresh()
+            return cached
         
-        return jobs
+        with self._first_load_lock:
+            if self._jobs_cache is None:
+                self._first_load()
+        return self._jobs_cache or _EMPTY_CATALOG
+    
+    def _first_load(self) -> None:
+        """Load jobs with nothing cached yet (caller holds _first_load_lock)"""
+        if not self.use_google_sheets:
+            self._jobs_cache = self._load_from_local()
+            return
+        
+        # Hedge: read the local file while Sheets is checked and downloaded. Sheets
+        # wins if it answers within JOBS_SHEETS_WAIT; otherwise the local jobs are
+        # served now and the Sheets result replaces them in the cache when it arrives
+        sheets_future = self._load_executor.submit(self._load_if_changed)
+        local_future = self._load_executor.submit(self._load_from_local)
+        catalog = None
+        late_sheets_future = None
+        try:
+            catalog = sheets_future.result(timeout=JOBS_SHEETS_WAIT)[1]
+        except FuturesTimeoutError:
+            logger.warning("[GET JOBS TOOL] ⚠️ Google Sheets slower than %.1fs, serving local file meanwhile",
+                           JOBS_SHEETS_WAIT)
+            late_sheets_future = sheets_future
+        if catalog is None:
+            catalog = local_future.result()
+        else:
+            local_future.cancel()
+        
+        if catalog is not None:
+            self._jobs_cache = catalog
+        if late_sheets_future is not None:
+            # Registered after the local jobs are cached, so the Sheets result always
+            # lands last (the callback runs right here if Sheets already finished)
+            late_sheets_future.add_done_callback(self._install_late_sheets_load)
+    
+    def _start_refresh(self) -> None:
+        """Refresh expired jobs in the background, unless a refresh is already running"""
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            future = self._load_executor.submit(self._refresh_jobs)
+        except RuntimeError:  # executor shut down at exit
+            self._refresh_lock.release()
+            return
+        future.add_done_callback(lambda _: self._refresh_lock.release())
+    
+    def _refresh_jobs(self) -> None:
+        """Replace the expired jobs if the sheet changed, else keep them for another JOBS_CACHE_TTL"""
+        cached = self._jobs_cache
+        changed, catalog = self._load_if_changed() if self.use_google_sheets else (True, None)
+        if changed and catalog is None:
+            catalog = self._load_from_local()
+        if catalog is not None:
+            self._jobs_cache = catalog
+        elif not changed and cached is not None:
+            logger.info("[GET JOBS TOOL] Google Sheets unchanged, keeping %d cached jobs", len(cached.jobs))
+            self._jobs_cache = replace(cached, expires_at=time.monotonic() + JOBS_CACHE_TTL)
+        # Nothing could be loaded: keep serving the expired jobs (retried on the next call)
     
     def get_current_jobs(self, position: Optional[str] = None, skills: Optional[str] = None) -> str:
         """
@@ -279,13 +738,13 @@ class GetCurrentJobsTool(Toolkit):
         """
         try:
             # Load jobs
-            jobs = self._load_jobs()
+            catalog = self._load_jobs()
+            jobs = catalog.jobs
             
             if not jobs:
                 return self._get_default_message()
             
             # Filter jobs based on criteria
-            matching_jobs = []
             search_terms = []
             
             if position:
@@ -296,39 +755,41 @@ class GetCurrentJobsTool(Toolkit):
             # Clean search terms
             search_terms = [term.strip() for term in search_terms if term.strip()]
             
-            for job in jobs:
-                if not search_terms:
-                    # No filter, return all jobs
-                    matching_jobs.append(job)
-                else:
-                    # Check if any search term matches
-                    job_text = f"{job.get('title', '')} {job.get('description', '')} {' '.join(job.get('skills', []))}".lower()
-                    if any(term in job_text for term in search_terms):
-                        matching_jobs.append(job)
+            if not search_terms:
+                # No filter, return all jobs
+                matching_jobs = list(jobs)
+            else:
+                matching_jobs = [jobs[pos] for pos in catalog.match(search_terms)]
             
             if not matching_jobs:
                 return self._get_default_message()
             
-            # Format results
-            result = "🎯 **Các vị trí tuyển dụng phù hợp:**\n\n"
-            for idx, job in enumerate(matching_jobs, 1):
-                result += f"**{idx}. {job.get('title', 'N/A')}**\n"
-                result += f"   - 📍 Địa điểm: {job.get('location', 'N/A')}\n"
-                result += f"   - 💼 Loại hình: {job.get('type', 'N/A')}\n"
-                result += f"   - 💰 Mức lương: {job.get('salary', 'Thỏa thuận')}\n"
-                result += f"   - 📝 Mô tả: {job.get('description', 'N/A')}\n"
+            # Format only the top_k most relevant jobs (collect lines and join once
+            # instead of growing a string); the rest are counted in one line
+            lines = ["🎯 **Các vị trí tuyển dụng phù hợp:**", ""]
+            for idx, job in enumerate(matching_jobs[:self.top_k], 1):
+                lines.append(f"**{idx}. {job.title}**")
+                lines.append(f"   - 📍 Địa điểm: {job.location}")
+                lines.append(f"   - 💼 Loại hình: {job.type}")
+                lines.append(f"   - 💰 Mức lương: {job.salary}")
+                lines.append(f"   - 📝 Mô tả: {job.description}")
                 
-                if job.get('skills'):
-                    result += f"   - 🔧 Kỹ năng: {', '.join(job.get('skills', []))}\n"
+                if job.skills:
+                    lines.append(f"   - 🔧 Kỹ năng: {', '.join(job.skills)}")
                 
-                if job.get('contact'):
-                    result += f"   - 📧 Liên hệ: {job.get('contact', '')}\n"
+                if job.contact:
+                    lines.append(f"   - 📧 Liên hệ: {job.contact}")
                 
-                result += "\n"
+                lines.append("")
+            
+            hidden = len(matching_jobs) - self.top_k
+            if hidden > 0:
+                lines.append(f"…và {hidden} vị trí khác. Bạn có thể mô tả cụ thể hơn để mình lọc chính xác hơn.")
             
-            result += "\n💡 Bạn có quan tâm đến vị trí nào không? Hãy để lại thông tin để chúng tôi liên hệ với bạn nhé!"
+            lines.append("")
+            lines.append("💡 Bạn có quan tâm đến vị trí nào không? Hãy để lại thông tin để chúng tôi liên hệ với bạn nhé!")
             
-            return result
+            return "\n".join(lines)
             
         except Exception as e:
             logger.error("[GET JOBS TOOL] ❌ Error in get_current_jobs: %s", e)
@@ -343,10 +804,44 @@ class GetCurrentJobsTool(Toolkit):
         )
 
 
+# Keep-alive pool for www.googleapis.com (HTTP/2 when the h2 package is
+# installed); dropped connections, rate limits and server errors are retried
+CSE_URL = "https://www.googleapis.com/customsearch/v1"
+CSE_TIMEOUT = 15
+CSE_POOL_CONNECTIONS = 4
+CSE_POOL_MAXSIZE = 16
+CSE_RETRY_TOTAL = 3
+CSE_RETRY_BACKOFF = 0.3
+CSE_RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+# Search responses reused for repeated queries (entries, seconds)
+CSE_CACHE_SIZE = 256
+CSE_CACHE_TTL = 15 * 60
+
+
+def _is_retryable_cse(exc: BaseException) -> bool:
+    """True for Custom Search responses that usually succeed when retried"""
+    import httpx
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code in CSE_RETRY_STATUS
+
+
+# Wraps the Custom Search request
+_with_cse_retry = retry(
+    wait=wait_exponential_jitter(initial=CSE_RETRY_BACKOFF, max=4),
+    stop=stop_after_attempt(CSE_RETRY_TOTAL + 1),
+    retry=retry_if_exception(_is_retryable_cse),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True,
+)
+
+
 class RecruitmentSearchTool(Toolkit):
     """
     Custom Google Search tool using Google Custom Search JSON API.
     Focused on recruitment websites (TopCV, VietnamWorks, TopDev, v.v.).
+    
+    Requests go through one pooled httpx.Client (thread-safe), so every search
+    reuses its keep-alive connections whichever thread the agent calls the
+    tool from. The client is closed at exit.
     """
 
     def __init__(self, name: str = "recruitment_search_tool"):
@@ -367,13 +862,46 @@ class RecruitmentSearchTool(Toolkit):
             "site:jobrapido.com",
             "site:topdev.vn",
         ]
+        # Pooled HTTP client, created on the first search
+        self._client: Optional["httpx.Client"] = None
+        self._client_lock = threading.Lock()
+        # (key namespace, query, num) -> response JSON; the namespace is a hash of
+        # the API key and cx so a credential change never serves old results
+        self._cache = TTLCache(maxsize=CSE_CACHE_SIZE, ttl=CSE_CACHE_TTL)
+        self._cache_lock = threading.Lock()
+        self._cache_namespace = hashlib.sha256(f"{self.api_key}:{self.cx}".encode("utf-8")).hexdigest()[:16]
         # Register tool function for the agent
         self.register(self.search_recruitment_info)
 
-    def _build_site_scope(self) -> str:
-        # Combine site scopes with OR to bias results to recruitment sites
-        # Example: (site:a OR site:b) query terms
-        return "(" + " OR ".join(self.recruitment_sites) + ")"
+    def _get_client(self) -> "httpx.Client":
+        """Pooled client shared by every search"""
+        with self._client_lock:
+            if self._client is None:
+                import httpx
+                from importlib.util import find_spec
+                
+                transport = httpx.HTTPTransport(
+                    http2=find_spec("h2") is not None,
+                    retries=CSE_RETRY_TOTAL,
+                    limits=httpx.Limits(
+                        max_connections=CSE_POOL_MAXSIZE,
+                        max_keepalive_connections=CSE_POOL_CONNECTIONS,
+                    ),
+                )
+                self._client = httpx.Client(
+                    transport=transport,
+                    timeout=CSE_TIMEOUT,
+                    headers={"Accept-Encoding": "gzip"},
+                )
+                atexit.register(self._client.close)
+            return self._client
+
+    @_with_cse_retry
+    def _fetch(self, params: dict) -> dict:
+        """One Custom Search request"""
+        resp = self._get_client().get(CSE_URL, params=params)
+        resp.raise_for_status()
+        return resp.json()
 
     def _call_google_cse(self, q: str, num: int) -> dict:
         if not self.api_key or not self.cx:
@@ -392,9 +920,26 @@ class RecruitmentSearchTool(Toolkit):
             "hl": "vi",
             "gl": "vn",
         }
-        resp = requests.get("https://www.googleapis.com/customsearch/v1", params=params, timeout=15)
-        resp.raise_for_status()
-        return resp.json()
+        cache_key = (self._cache_namespace, q, n)
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+        if cached is not None:
+            logger.debug("[RECRUITMENT SEARCH TOOL] Cache hit for query: %s", q)
+            return cached
+        
+        data = self._fetch(params)
+        with self._cache_lock:
+            self._cache[cache_key] = data
+        return data
+
+    def _search(self, query: str, max_results: int) -> list:
+        """
+        Run one Custom Search query and return its items.
+        
+        The query is sent as-is, one billed request per search; the cx search
+        engine configuration decides which sites are covered.
+        """
+        return self._call_google_cse(query, max_results).get("items", [])
 
     def search_recruitment_info(self, query: str, max_results: int = 5) -> str:
         """
@@ -408,8 +953,7 @@ class RecruitmentSearchTool(Toolkit):
             Chuỗi kết quả đã định dạng kèm liên kết nguồn.
         """
         try:
-            data = self._call_google_cse(query, max_results)
-            items = data.get("items", [])
+            items = self._search(query, max_results)
             if not items:
                 return "Không tìm thấy kết quả phù hợp. Bạn có thể thử mô tả cụ thể hơn."
 